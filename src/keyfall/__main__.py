@@ -2,13 +2,15 @@
 
 import argparse
 
-from keyfall.app import App
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="KeyFall — piano learning game")
     parser.add_argument("--songs-dir", default="", help="Directory containing MIDI/MusicXML files")
     args = parser.parse_args()
+
+    # Imported after parsing so --help doesn't load pygame, MIDI and audio
+    from keyfall.app import App
+
     app = App(songs_dir=args.songs_dir)
     app.run()
 
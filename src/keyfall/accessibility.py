@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
 import subprocess
 import sys
-from dataclasses import asdict, dataclass
+import threading
+from dataclasses import asdict, dataclass, replace
 from enum import Enum, auto
 from pathlib import Path
 
+import keyfall.renderer.colors as colors
+from keyfall.renderer.colors import DEFAULT_PACK, ColorPack
+
 
 class ColorPalette(Enum):
     DEFAULT = auto()       # Blue / Orange
@@ -26,6 +32,11 @@ class NoteLabelMode(Enum):
     MIDI_NUMBER = auto()
 
 
+# Plain-dict name lookups; avoids Enum.__getitem__ and a KeyError on misses
+_PALETTE_BY_NAME: dict[str, ColorPalette] = {p.name: p for p in ColorPalette}
+_LABEL_MODE_BY_NAME: dict[str, NoteLabelMode] = {m.name: m for m in NoteLabelMode}
+
+
 # RGB palette sets: (right_hand, left_hand, bg)
 PALETTE_COLORS: dict[ColorPalette, tuple[tuple[int, int, int], tuple[int, int, int], tuple[int, int, int]]] = {
     ColorPalette.DEFAULT: ((66, 135, 245), (245, 166, 66), (18, 18, 24)),
@@ -36,6 +47,24 @@ PALETTE_COLORS: dict[ColorPalette, tuple[tuple[int, int, int], tuple[int, int, i
 }
 
 
+def _build_color_packs() -> dict[ColorPalette, ColorPack]:
+    packs = {
+        palette: replace(DEFAULT_PACK, note_rh=rh, note_lh=lh, bg=bg)
+        for palette, (rh, lh, bg) in PALETTE_COLORS.items()
+    }
+    packs[ColorPalette.HIGH_CONTRAST] = replace(
+        packs[ColorPalette.HIGH_CONTRAST],
+        hud_text=(255, 255, 255),
+        white_key=(255, 255, 255),
+        black_key=(0, 0, 0),
+    )
+    return packs
+
+
+# Full renderer color set per palette, installed with a single colors.apply()
+_COLOR_PACKS = _build_color_packs()
+
+
 @dataclass
 class AccessibilitySettings:
     color_palette: str = "DEFAULT"
@@ -46,47 +75,73 @@ class AccessibilitySettings:
     input_latency_offset_ms: float = 0.0
 
     def get_palette(self) -> ColorPalette:
-        try:
-            return ColorPalette[self.color_palette]
-        except KeyError:
-            return ColorPalette.DEFAULT
+        return _PALETTE_BY_NAME.get(self.color_palette, ColorPalette.DEFAULT)
 
     def get_label_mode(self) -> NoteLabelMode:
-        try:
-            return NoteLabelMode[self.note_labels]
-        except KeyError:
-            return NoteLabelMode.NONE
+        return _LABEL_MODE_BY_NAME.get(self.note_labels, NoteLabelMode.NONE)
 
 
 _SETTINGS_PATH = Path.home() / ".keyfall" / "settings.json"
 
+# (st_mtime_ns, file contents, parsed settings) as last read or written
+_CACHE: tuple[int, dict, AccessibilitySettings] | None = None
 
-def load_settings() -> AccessibilitySettings:
-    """Load accessibility settings from disk, returning defaults if absent."""
-    if not _SETTINGS_PATH.exists():
-        return AccessibilitySettings()
+
+def _read_settings_file() -> tuple[dict, AccessibilitySettings] | None:
+    """Return the settings file's contents and parsed settings, or None if unreadable.
+
+    The file is only re-read when its mtime differs from the cached copy.
+    """
+    global _CACHE
     try:
-        data = json.loads(_SETTINGS_PATH.read_text())
-        a11y = data.get("accessibility", {})
-        return AccessibilitySettings(**{
-            k: v for k, v in a11y.items()
-            if k in AccessibilitySettings.__dataclass_fields__
-        })
-    except Exception:
+        mtime = _SETTINGS_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+    if _CACHE is None or _CACHE[0] != mtime:
+        try:
+            data = json.loads(_SETTINGS_PATH.read_text())
+            a11y = data.get("accessibility", {})
+            settings = AccessibilitySettings(**{
+                k: v for k, v in a11y.items()
+                if k in AccessibilitySettings.__dataclass_fields__
+            })
+        except Exception:
+            return None
+        _CACHE = (mtime, data, settings)
+    return _CACHE[1], _CACHE[2]
+
+
+def load_settings() -> AccessibilitySettings:
+    """Load accessibility settings from disk, returning defaults if absent.
+
+    The parsed result is cached and reused until the file's mtime changes.
+    """
+    cached = _read_settings_file()
+    if cached is None:
         return AccessibilitySettings()
+    return replace(cached[1])
 
 
 def save_settings(settings: AccessibilitySettings) -> None:
-    """Persist accessibility settings to disk."""
+    """Persist accessibility settings to disk.
+
+    Other sections of the file are kept. The new contents are written to a
+    temporary file and moved into place, so an interrupted save never leaves
+    a truncated settings file behind.
+    """
+    global _CACHE
+    cached = _read_settings_file()
+    a11y = asdict(settings)
+    if cached is not None and cached[0].get("accessibility") == a11y:
+        return  # nothing changed
+
+    data = dict(cached[0]) if cached is not None else {}
+    data["accessibility"] = a11y
     _SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    data: dict = {}
-    if _SETTINGS_PATH.exists():
-        try:
-            data = json.loads(_SETTINGS_PATH.read_text())
-        except Exception:
-            pass
-    data["accessibility"] = asdict(settings)
-    _SETTINGS_PATH.write_text(json.dumps(data, indent=2))
+    tmp_path = _SETTINGS_PATH.with_name(_SETTINGS_PATH.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2))
+    os.replace(tmp_path, _SETTINGS_PATH)
+    _CACHE = (_SETTINGS_PATH.stat().st_mtime_ns, data, replace(settings))
 
 
 def apply_accessibility(settings: AccessibilitySettings) -> None:
@@ -94,41 +149,74 @@ def apply_accessibility(settings: AccessibilitySettings) -> None:
 
     This modifies the global color values used by the renderers at runtime.
     """
-    import keyfall.renderer.colors as colors
-
     palette = settings.get_palette()
     if settings.high_contrast:
         palette = ColorPalette.HIGH_CONTRAST
 
-    rh, lh, bg = PALETTE_COLORS.get(palette, PALETTE_COLORS[ColorPalette.DEFAULT])
-    colors.NOTE_RIGHT_HAND = rh
-    colors.NOTE_LEFT_HAND = lh
-    colors.BG = bg
-
-    if palette == ColorPalette.HIGH_CONTRAST:
-        colors.HUD_TEXT = (255, 255, 255)
-        colors.WHITE_KEY = (255, 255, 255)
-        colors.BLACK_KEY = (0, 0, 0)
+    colors.apply(_COLOR_PACKS.get(palette, _COLOR_PACKS[ColorPalette.DEFAULT]))
 
     if settings.screen_reader:
         speak("Accessibility settings applied")
 
 
+# Queue feeding the background TTS thread; created on first speak()
+_speech_queue: queue.Queue[str] | None = None
+
+# Long-lived PowerShell loop that speaks each line written to its stdin
+_WIN_SPEECH_LOOP = (
+    "Add-Type -AssemblyName System.Speech; "
+    "$s = New-Object System.Speech.Synthesis.SpeechSynthesizer; "
+    "while (($line = [Console]::In.ReadLine()) -ne $null) { $s.Speak($line) }"
+)
+
+
+def _speech_worker(texts: queue.Queue[str]) -> None:
+    """Announce queued text, one announcement at a time, until the process exits.
+
+    Each espeak or say process is waited for, so announcements are spoken in
+    order rather than over each other; the Windows helper already speaks
+    its lines one after another.
+    """
+    helper: subprocess.Popen | None = None
+    while True:
+        text = texts.get()
+        try:
+            if sys.platform == "linux":
+                subprocess.run(
+                    ["espeak", "-s", "160", text],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+            elif sys.platform == "darwin":
+                subprocess.run(
+                    ["say", text],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                )
+            elif sys.platform == "win32":
+                # Starting PowerShell and loading System.Speech takes ~0.5s,
+                # so one helper is kept alive and fed a line per announcement
+                if helper is None or helper.poll() is not None:
+                    helper = subprocess.Popen(
+                        ["powershell", "-NoProfile", "-Command", _WIN_SPEECH_LOOP],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                        text=True,
+                    )
+                helper.stdin.write(" ".join(text.splitlines()) + "\n")
+                helper.stdin.flush()
+        except OSError:
+            helper = None
+
+
 def speak(text: str) -> None:
-    """Fire-and-forget TTS announcement. No-op if TTS unavailable."""
-    try:
-        if sys.platform == "linux":
-            subprocess.Popen(
-                ["espeak", "-s", "160", text],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-            )
-        elif sys.platform == "darwin":
-            subprocess.Popen(["say", text], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        elif sys.platform == "win32":
-            subprocess.Popen(
-                ["powershell", "-Command",
-                 f"(New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak('{text}')"],
-                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-            )
-    except FileNotFoundError:
-        pass
+    """Fire-and-forget TTS announcement. No-op if TTS unavailable.
+
+    The text is queued for a background thread, so callers never wait on
+    a TTS process starting up.
+    """
+    global _speech_queue
+    if _speech_queue is None:
+        _speech_queue = queue.Queue()
+        threading.Thread(
+            target=_speech_worker, args=(_speech_queue,), name="keyfall-tts", daemon=True,
+        ).start()
+    _speech_queue.put(text)
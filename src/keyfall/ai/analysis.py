@@ -0,0 +1,127 @@
+"""Shared column view of a song's notes for the analysis modules."""
+
+from __future__ import annotations
+
+import weakref
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import accumulate, islice, repeat
+from operator import eq, le
+
+from keyfall.models import HAND_CODES, Hand, NoteColumns, NoteEvent, Song
+
+# Hand codes stored in SongAnalysis.hand, as in NoteColumns.hand
+LEFT, RIGHT, BOTH = HAND_CODES[Hand.LEFT], HAND_CODES[Hand.RIGHT], HAND_CODES[Hand.BOTH]
+
+
+@dataclass(frozen=True, slots=True)
+class SongContext:
+    """Tempo-derived constants of a song, computed once per analysis."""
+
+    bpm: float
+    beat_duration: float
+    bar_duration: float
+    n_notes: int
+
+
+def song_context(song: Song, beats_per_bar: int = 4) -> SongContext:
+    """Derive beat and bar lengths from the song's opening tempo (120 BPM if none)."""
+    bpm = 120.0
+    if song.tempo_changes:
+        bpm = song.tempo_changes[0].bpm
+    beat_duration = 60.0 / bpm
+    return SongContext(
+        bpm=bpm,
+        beat_duration=beat_duration,
+        bar_duration=beat_duration * beats_per_bar,
+        n_notes=len(song.notes),
+    )
+
+
+@dataclass
+class SongAnalysis:
+    """A song's notes in start-time order, as parallel columns split into bars.
+
+    The notes of bar ``k`` (0-indexed) sit at indices ``edges[k]:edges[k + 1]``
+    of ``notes`` and of every column.
+    """
+
+    notes: list[NoteEvent]
+    starts: array  # start_time of each note
+    pitch: array
+    dur: array
+    hand: array  # LEFT / RIGHT / BOTH codes
+    bar_duration: float
+    edges: list[int] = field(default_factory=list)
+    # cum_lh[i] / cum_rh[i]: LEFT-only / RIGHT-only notes among the first i
+    cum_lh: list[int] = field(default_factory=list)
+    cum_rh: list[int] = field(default_factory=list)
+
+    @property
+    def total_bars(self) -> int:
+        return len(self.edges) - 1
+
+    def bar_notes(self, bar_start: int, bar_end: int) -> list[NoteEvent]:
+        """Return the notes of bars ``bar_start`` up to (not including) ``bar_end``."""
+        return self.notes[self.edges[bar_start]:self.edges[bar_end]]
+
+
+# (song, its column view, song duration, bar_duration, analysis) of the last
+# song analyzed; the bar layout depends on the duration as well as the notes
+_last: tuple[weakref.ref, NoteColumns, float, float, SongAnalysis] | None = None
+
+
+def analyze(song: Song, bar_duration: float) -> SongAnalysis:
+    """Build the column view of ``song`` with bars of ``bar_duration`` seconds.
+
+    The columns come from Song.columns(). The result for the most recent
+    song is kept for as long as that column view and the song's duration
+    are current, so difficulty estimation and practice planning on the
+    same song share one analysis, and editing or replacing the notes, or
+    changing the duration, yields a fresh one.
+    """
+    global _last
+    cols = song.columns()
+    if _last is not None:
+        ref, cached_cols, cached_duration, cached_bar, analysis = _last
+        if (
+            ref() is song
+            and cached_cols is cols
+            and cached_duration == song.duration
+            and cached_bar == bar_duration
+        ):
+            return analysis
+
+    # Loaded songs are already in start-time order, so the song's columns
+    # serve as they are; otherwise sort (stably) by start time
+    starts = cols.start_time
+    pitch, dur, hand = cols.pitch, cols.duration, cols.hand
+    if all(map(le, starts, islice(starts, 1, None))):
+        notes = list(song.notes)
+    else:
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        notes = [song.notes[i] for i in order]
+        starts = array("d", [starts[i] for i in order])
+        pitch = array("b", [pitch[i] for i in order])
+        dur = array("d", [dur[i] for i in order])
+        hand = array("b", [hand[i] for i in order])
+
+    analysis = SongAnalysis(
+        notes=notes,
+        starts=starts,
+        pitch=pitch,
+        dur=dur,
+        hand=hand,
+        bar_duration=bar_duration,
+        cum_lh=list(accumulate(map(eq, hand, repeat(LEFT)), initial=0)),
+        cum_rh=list(accumulate(map(eq, hand, repeat(RIGHT)), initial=0)),
+    )
+    if bar_duration > 0:
+        total_bars = int(song.duration / bar_duration) + 1
+        analysis.edges = [
+            bisect_left(starts, bar * bar_duration) for bar in range(total_bars + 1)
+        ]
+
+    _last = (weakref.ref(song), cols, song.duration, bar_duration, analysis)
+    return analysis
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import heapq
+from array import array
 from dataclasses import dataclass, field
+from itertools import islice
+from operator import mul, sub
 
-from keyfall.models import Hand, Song
+from keyfall.ai.analysis import LEFT, RIGHT, SongAnalysis, SongContext, analyze, song_context
+from keyfall.models import Song
 
 
 @dataclass
@@ -29,83 +34,164 @@ _LEVEL_LABELS = {
 }
 
 
-def _label_for_level(level: int) -> str:
+def _scan_label(level: int) -> str:
     for (lo, hi), label in _LEVEL_LABELS.items():
         if lo <= level <= hi:
             return label
     return "Expert"
 
 
-def _note_density_score(song: Song) -> float:
+# Label for every level 0-18, indexed directly by level
+_LEVEL_LABEL_TABLE = tuple(_scan_label(level) for level in range(19))
+
+
+def _label_for_level(level: int) -> str:
+    if 0 <= level < len(_LEVEL_LABEL_TABLE):
+        return _LEVEL_LABEL_TABLE[level]
+    return "Expert"
+
+
+@dataclass
+class _SongStats:
+    """Aggregates gathered in one pass over the note columns."""
+
+    n_notes: int = 0
+    lh_count: int = 0  # BOTH notes count for each hand
+    rh_count: int = 0
+    pitch_min: int = 0
+    pitch_max: int = 0
+    pitch_class_mask: int = 0  # bit k set if pitch class k occurs
+    # One byte per nearest-50ms onset bucket: bit 0 = LH active, bit 1 = RH
+    hand_buckets: bytearray = field(default_factory=bytearray)
+    n_onsets: int = 0  # distinct nearest-10ms onset buckets
+    intervals: int = 0  # consecutive same-hand intervals
+    large_leaps: int = 0  # ... of which wider than an octave
+    durations: set[float] = field(default_factory=set)
+    offbeat_count: int = 0
+
+
+def _collect_stats(analysis: SongAnalysis, ctx: SongContext) -> _SongStats:
+    """Walk the note columns once, updating every scorer's aggregates."""
+    pitch = analysis.pitch
+    beat_duration = ctx.beat_duration
+    stats = _SongStats(n_notes=ctx.n_notes)
+    if not pitch:
+        return stats
+
+    # Columns are time-sorted, so the first and last starts bound the buckets
+    starts = analysis.starts
+    first_bucket = int(starts[0] * 20.0 + 0.5)
+    hand_buckets = bytearray(int(starts[-1] * 20.0 + 0.5) - first_bucket + 1)
+    stats.hand_buckets = hand_buckets
+    dur_add = stats.durations.add
+    lh_count = rh_count = intervals = large_leaps = offbeat = pc_mask = 0
+    n_onsets = 0
+    prev_onset = None
+    pmin = pmax = pitch[0]
+    prev_lh = prev_rh = None
+
+    for p, t, d, h in zip(pitch, starts, analysis.dur, analysis.hand):
+        if p < pmin:
+            pmin = p
+        elif p > pmax:
+            pmax = p
+        pc_mask |= 1 << (p % 12)
+        dur_add(round(d, 3))
+
+        # Columns are time-sorted, so equal buckets are always adjacent
+        bucket = int(t * 100.0 + 0.5)
+        if bucket != prev_onset:
+            n_onsets += 1
+            prev_onset = bucket
+
+        # Off-beat if not near 0.0 or 0.5 of the beat
+        beat_position = (t % beat_duration) / beat_duration
+        if beat_position > 0.1 and not -0.1 <= beat_position - 0.5 <= 0.1:
+            offbeat += 1
+
+        bucket = int(t * 20.0 + 0.5) - first_bucket
+        if h != RIGHT:
+            lh_count += 1
+            hand_buckets[bucket] |= 1
+            if prev_lh is not None:
+                intervals += 1
+                if not -12 <= p - prev_lh <= 12:
+                    large_leaps += 1
+            prev_lh = p
+        if h != LEFT:
+            rh_count += 1
+            hand_buckets[bucket] |= 2
+            if prev_rh is not None:
+                intervals += 1
+                if not -12 <= p - prev_rh <= 12:
+                    large_leaps += 1
+            prev_rh = p
+
+    stats.lh_count = lh_count
+    stats.rh_count = rh_count
+    stats.pitch_min = pmin
+    stats.pitch_max = pmax
+    stats.pitch_class_mask = pc_mask
+    stats.n_onsets = n_onsets
+    stats.intervals = intervals
+    stats.large_leaps = large_leaps
+    stats.offbeat_count = offbeat
+    return stats
+
+
+def _note_density_score(stats: _SongStats, song_duration: float) -> float:
     """Score based on notes per second per hand (0.0 - 1.0).
 
     < 1 nps = 0.0, > 8 nps = 1.0, linear in between.
     """
-    if not song.notes or song.duration <= 0:
+    if not stats.n_notes or song_duration <= 0:
         return 0.0
 
     # Compute per-hand density using the denser hand
-    lh = [n for n in song.notes if n.hand in (Hand.LEFT, Hand.BOTH)]
-    rh = [n for n in song.notes if n.hand in (Hand.RIGHT, Hand.BOTH)]
-
-    lh_density = len(lh) / song.duration if lh else 0.0
-    rh_density = len(rh) / song.duration if rh else 0.0
+    lh_density = stats.lh_count / song_duration
+    rh_density = stats.rh_count / song_duration
     max_density = max(lh_density, rh_density)
 
     return min(1.0, max(0.0, (max_density - 1.0) / 7.0))
 
 
-def _pitch_range_score(song: Song) -> float:
+def _pitch_range_score(stats: _SongStats) -> float:
     """Score based on total pitch span used (0.0 - 1.0).
 
     < 1 octave = 0.0, > 5 octaves = 1.0.
     """
-    if not song.notes:
+    if not stats.n_notes:
         return 0.0
 
-    pitches = [n.pitch for n in song.notes]
-    span = max(pitches) - min(pitches)
+    span = stats.pitch_max - stats.pitch_min
 
     return min(1.0, max(0.0, (span - 12) / 48.0))
 
 
-def _hand_independence_score(song: Song) -> float:
+def _hand_independence_score(stats: _SongStats) -> float:
     """Score based on rhythmic divergence between hands (0.0 - 1.0).
 
     Measures how often both hands play simultaneously vs alternating.
     High simultaneous + different rhythms = high independence requirement.
     """
-    if not song.notes:
-        return 0.0
-
-    lh_times = set()
-    rh_times = set()
-
-    # Quantize to 50ms buckets for comparison
-    for n in song.notes:
-        bucket = round(n.start_time / 0.05)
-        if n.hand == Hand.LEFT:
-            lh_times.add(bucket)
-        elif n.hand == Hand.RIGHT:
-            rh_times.add(bucket)
-        else:
-            lh_times.add(bucket)
-            rh_times.add(bucket)
+    buckets = stats.hand_buckets
+    # Overlap: buckets where both hands are active
+    overlap = buckets.count(3)
+    lh_times = buckets.count(1) + overlap
+    rh_times = buckets.count(2) + overlap
 
     if not lh_times or not rh_times:
         return 0.0
 
-    # Overlap: buckets where both hands are active
-    overlap = len(lh_times & rh_times)
     # Non-overlap: buckets unique to one hand
-    total = len(lh_times | rh_times)
+    total = len(buckets) - buckets.count(0)
 
     if total == 0:
         return 0.0
 
     # High overlap with different total counts = independent parts
     overlap_ratio = overlap / total
-    size_ratio = min(len(lh_times), len(rh_times)) / max(len(lh_times), len(rh_times))
+    size_ratio = min(lh_times, rh_times) / max(lh_times, rh_times)
 
     # Both hands active and roughly equal activity = independence
     independence = overlap_ratio * size_ratio
@@ -113,151 +199,97 @@ def _hand_independence_score(song: Song) -> float:
     return min(1.0, independence * 2.0)
 
 
-def _interval_complexity_score(song: Song) -> float:
+def _interval_complexity_score(stats: _SongStats) -> float:
     """Score based on frequency of large leaps (0.0 - 1.0).
 
     Measures consecutive-note intervals > octave within each hand.
     """
-    if len(song.notes) < 2:
+    if stats.intervals == 0:
         return 0.0
 
-    # Sort notes per hand by time
-    by_hand: dict[Hand, list[int]] = {Hand.LEFT: [], Hand.RIGHT: []}
-    for n in sorted(song.notes, key=lambda x: x.start_time):
-        if n.hand in by_hand:
-            by_hand[n.hand].append(n.pitch)
-        else:
-            by_hand[Hand.LEFT].append(n.pitch)
-            by_hand[Hand.RIGHT].append(n.pitch)
-
-    large_leaps = 0
-    total_intervals = 0
-
-    for pitches in by_hand.values():
-        for i in range(1, len(pitches)):
-            interval = abs(pitches[i] - pitches[i - 1])
-            total_intervals += 1
-            if interval > 12:
-                large_leaps += 1
-
-    if total_intervals == 0:
-        return 0.0
-
-    leap_ratio = large_leaps / total_intervals
+    leap_ratio = stats.large_leaps / stats.intervals
     return min(1.0, leap_ratio * 5.0)  # 20% large leaps = max score
 
 
-def _rhythmic_complexity_score(song: Song) -> float:
+def _rhythmic_complexity_score(stats: _SongStats) -> float:
     """Score based on variety of note durations and syncopation (0.0 - 1.0).
 
     More unique duration values and off-beat starts = higher complexity.
     """
-    if not song.notes:
+    if not stats.n_notes:
         return 0.0
 
-    durations = [round(n.duration, 3) for n in song.notes]
-    unique_durations = len(set(durations))
-
     # Variety score: many different durations = complex rhythm
-    variety = min(1.0, unique_durations / 12.0)
+    variety = min(1.0, len(stats.durations) / 12.0)
 
     # Syncopation: notes starting on off-beats
-    # Assume quarter note = beat_duration from tempo
-    bpm = 120.0
-    if song.tempo_changes:
-        bpm = song.tempo_changes[0].bpm
-    beat_duration = 60.0 / bpm
-
-    offbeat_count = 0
-    for n in song.notes:
-        beat_position = (n.start_time % beat_duration) / beat_duration
-        # Off-beat if not near 0.0 or 0.5
-        if beat_position > 0.1 and abs(beat_position - 0.5) > 0.1:
-            offbeat_count += 1
-
-    syncopation = offbeat_count / max(len(song.notes), 1)
+    syncopation = stats.offbeat_count / stats.n_notes
 
     return min(1.0, (variety * 0.5 + syncopation * 0.5))
 
 
-def _tempo_score(song: Song) -> float:
+def _tempo_score(bpm: float) -> float:
     """Score based on tempo (0.0 - 1.0).
 
     < 60 BPM = 0.0, > 180 BPM = 1.0.
     """
-    bpm = 120.0
-    if song.tempo_changes:
-        bpm = song.tempo_changes[0].bpm
-
     return min(1.0, max(0.0, (bpm - 60.0) / 120.0))
 
 
-def _key_complexity_score(song: Song) -> float:
+def _key_complexity_score(stats: _SongStats) -> float:
     """Score based on pitch class distribution (0.0 - 1.0).
 
     More distinct pitch classes used = likely more accidentals.
     All 12 pitch classes = chromatic / atonal = max complexity.
     """
-    if not song.notes:
+    if not stats.n_notes:
         return 0.0
 
-    pitch_classes = set(n.pitch % 12 for n in song.notes)
     # C major uses 7 pitch classes. 7 = baseline (0.0), 12 = max (1.0)
-    return min(1.0, max(0.0, (len(pitch_classes) - 7) / 5.0))
+    return min(1.0, max(0.0, (stats.pitch_class_mask.bit_count() - 7) / 5.0))
 
 
-def _chord_density_score(song: Song) -> float:
+def _chord_density_score(stats: _SongStats) -> float:
     """Score based on simultaneous notes (0.0 - 1.0).
 
     Measures average number of notes sounding at each onset time.
     Single notes = 0.0, 6+ note chords = 1.0.
     """
-    if not song.notes:
+    if not stats.n_onsets:
         return 0.0
 
-    # Group by quantized onset time (10ms buckets)
-    onsets: dict[int, int] = {}
-    for n in song.notes:
-        bucket = round(n.start_time / 0.01)
-        onsets[bucket] = onsets.get(bucket, 0) + 1
-
-    if not onsets:
-        return 0.0
-
-    avg_simultaneous = sum(onsets.values()) / len(onsets)
+    avg_simultaneous = stats.n_notes / stats.n_onsets
 
     return min(1.0, max(0.0, (avg_simultaneous - 1.0) / 5.0))
 
 
-def _find_hardest_bars(song: Song, beat_duration: float, beats_per_bar: int = 4) -> list[int]:
+def _find_hardest_bars(analysis: SongAnalysis) -> list[int]:
     """Return the bar numbers with the highest local difficulty."""
-    if not song.notes or beat_duration <= 0:
+    pitch = analysis.pitch
+    if not pitch or analysis.bar_duration <= 0:
         return []
 
-    bar_duration = beat_duration * beats_per_bar
-    total_bars = int(song.duration / bar_duration) + 1
+    bar_duration = analysis.bar_duration
+    edges = analysis.edges
+
+    # jumps[i] is the interval from note i to note i + 1, in time order
+    jumps = array("B", map(abs, map(sub, islice(pitch, 1, None), pitch)))
 
     bar_scores: list[tuple[float, int]] = []
-    for bar in range(total_bars):
-        t_start = bar * bar_duration
-        t_end = t_start + bar_duration
-        bar_notes = [n for n in song.notes if t_start <= n.start_time < t_end]
+    for bar in range(analysis.total_bars):
+        lo, hi = edges[bar], edges[bar + 1]
 
-        if not bar_notes:
+        if lo == hi:
             continue
 
         # Simple local difficulty: density + interval jumps
-        density = len(bar_notes) / bar_duration
-        pitches = [n.pitch for n in bar_notes]
-        max_jump = 0
-        for i in range(1, len(pitches)):
-            max_jump = max(max_jump, abs(pitches[i] - pitches[i - 1]))
+        density = (hi - lo) / bar_duration
+        max_jump = max(jumps[lo:hi - 1], default=0)
 
         score = density * 0.7 + (max_jump / 24.0) * 0.3
         bar_scores.append((score, bar + 1))  # 1-indexed bar numbers
 
-    bar_scores.sort(reverse=True)
-    return [bar for _, bar in bar_scores[:5]]
+    return [bar for _, bar in heapq.nlargest(5, bar_scores)]
 
 
 # Dimension weights for the weighted sum
@@ -272,6 +304,10 @@ _WEIGHTS = {
     "chord_density": 0.10,
 }
 
+# Fixed feature order so the weighted sum is a flat dot product
+_FEATURE_KEYS = tuple(_WEIGHTS)
+_WEIGHT_VEC = tuple(_WEIGHTS[k] for k in _FEATURE_KEYS)
+
 
 def estimate(song: Song) -> DifficultyReport:
     """Estimate the difficulty of a song on a 1-18 scale.
@@ -283,29 +319,28 @@ def estimate(song: Song) -> DifficultyReport:
         A DifficultyReport with overall level, per-dimension scores,
         hardest bars, and a human-readable description.
     """
+    ctx = song_context(song)
+    analysis = analyze(song, ctx.bar_duration)
+    stats = _collect_stats(analysis, ctx)
+
     factors = {
-        "note_density": _note_density_score(song),
-        "pitch_range": _pitch_range_score(song),
-        "hand_independence": _hand_independence_score(song),
-        "interval_complexity": _interval_complexity_score(song),
-        "rhythmic_complexity": _rhythmic_complexity_score(song),
-        "tempo": _tempo_score(song),
-        "key_complexity": _key_complexity_score(song),
-        "chord_density": _chord_density_score(song),
+        "note_density": _note_density_score(stats, song.duration),
+        "pitch_range": _pitch_range_score(stats),
+        "hand_independence": _hand_independence_score(stats),
+        "interval_complexity": _interval_complexity_score(stats),
+        "rhythmic_complexity": _rhythmic_complexity_score(stats),
+        "tempo": _tempo_score(ctx.bpm),
+        "key_complexity": _key_complexity_score(stats),
+        "chord_density": _chord_density_score(stats),
     }
 
-    weighted_sum = sum(factors[k] * _WEIGHTS[k] for k in _WEIGHTS)
+    weighted_sum = sum(map(mul, map(factors.__getitem__, _FEATURE_KEYS), _WEIGHT_VEC))
 
     # Map 0.0-1.0 weighted sum to 1-18 level
     level = max(1, min(18, round(weighted_sum * 17) + 1))
     label = _label_for_level(level)
 
-    bpm = 120.0
-    if song.tempo_changes:
-        bpm = song.tempo_changes[0].bpm
-    beat_duration = 60.0 / bpm
-
-    hardest = _find_hardest_bars(song, beat_duration)
+    hardest = _find_hardest_bars(analysis)
 
     # Build description
     top_factors = sorted(factors.items(), key=lambda x: x[1], reverse=True)[:3]
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 
+from keyfall.ai.analysis import SongContext, analyze, song_context
 from keyfall.models import Hand, NoteEvent, Song
 
 
@@ -68,7 +69,7 @@ def _compute_section_accuracy(
 
 
 def _identify_weak_sections(
-    song: Song, history: list[dict], beat_duration: float
+    song: Song, history: list[dict], ctx: SongContext
 ) -> list[tuple[int, int, str, Hand]]:
     """Identify bar ranges that need the most work.
 
@@ -76,47 +77,52 @@ def _identify_weak_sections(
     to find inherently difficult passages and pair them with overall accuracy.
     Returns list of (bar_start, bar_end, reason, hand).
     """
-    if not song.notes:
+    if not ctx.n_notes:
         return []
 
-    beats_per_bar = 4
-    bar_duration = beat_duration * beats_per_bar
-    total_bars = _bar_for_time(song.duration, beat_duration, beats_per_bar) + 1
+    bar_duration = ctx.bar_duration
+    # Shared with difficulty.estimate(), so the song is only sorted once
+    analysis = analyze(song, bar_duration)
+    total_bars = analysis.total_bars
 
     weak_sections: list[tuple[int, int, str, Hand]] = []
 
+    notes = analysis.notes
+    edges = analysis.edges
+    # Running LH/RH note counts, so each window's counts are two subtractions
+    cum_lh = analysis.cum_lh
+    cum_rh = analysis.cum_rh
+
     # Scan in 4-bar windows for density spikes and large intervals
     window = 4
     for bar in range(0, total_bars, window):
         bar_end = min(bar + window, total_bars)
-        t_start = bar * bar_duration
-        t_end = bar_end * bar_duration
-
-        window_notes = [n for n in song.notes if t_start <= n.start_time < t_end]
-        if not window_notes:
+        lo, hi = edges[bar], edges[bar_end]
+        if lo == hi:
             continue
 
         # Check note density (notes per second)
+        t_start = bar * bar_duration
+        t_end = bar_end * bar_duration
         window_duration = t_end - t_start
-        density = len(window_notes) / max(window_duration, 0.01)
+        density = (hi - lo) / max(window_duration, 0.01)
+
+        # Flag as weak if any difficulty indicator is high; each check only
+        # runs when the ones before it didn't fire
+        if density > 4.0:
+            weak_sections.append(
+                (bar, bar_end, f"High note density ({density:.1f} notes/sec)", Hand.BOTH)
+            )
+            continue
 
         # Check for large interval jumps
+        window_notes = notes[lo:hi]
         pitches = sorted(set(n.pitch for n in window_notes))
         max_jump = 0
         for i in range(1, len(pitches)):
             max_jump = max(max_jump, pitches[i] - pitches[i - 1])
 
-        # Check hand independence (both hands active with different rhythms)
-        lh_notes = [n for n in window_notes if n.hand == Hand.LEFT]
-        rh_notes = [n for n in window_notes if n.hand == Hand.RIGHT]
-        has_independence = len(lh_notes) > 2 and len(rh_notes) > 2
-
-        # Flag as weak if any difficulty indicator is high
-        if density > 4.0:
-            weak_sections.append(
-                (bar, bar_end, f"High note density ({density:.1f} notes/sec)", Hand.BOTH)
-            )
-        elif max_jump > 12:
+        if max_jump > 12:
             hand = Hand.BOTH
             if all(n.hand == Hand.LEFT for n in window_notes if abs(n.pitch - min(pitches)) < 3):
                 hand = Hand.LEFT
@@ -125,7 +131,12 @@ def _identify_weak_sections(
             weak_sections.append(
                 (bar, bar_end, f"Large interval leap ({max_jump} semitones)", hand)
             )
-        elif has_independence:
+            continue
+
+        # Check hand independence (both hands active with different rhythms)
+        lh_count = cum_lh[hi] - cum_lh[lo]
+        rh_count = cum_rh[hi] - cum_rh[lo]
+        if lh_count > 2 and rh_count > 2:
             weak_sections.append(
                 (bar, bar_end, "Complex hand independence", Hand.BOTH)
             )
@@ -165,10 +176,7 @@ def generate_plan(
         return plan
 
     # Determine beat duration from tempo
-    bpm = 120.0
-    if song.tempo_changes:
-        bpm = song.tempo_changes[0].bpm
-    beat_duration = 60.0 / bpm
+    ctx = song_context(song)
 
     # Analyze history
     stats = _compute_section_accuracy(history, song.title)
@@ -190,10 +198,10 @@ def generate_plan(
     else:
         base_tempo_pct = 100
 
-    total_bars = _bar_for_time(song.duration, beat_duration) + 1
+    total_bars = _bar_for_time(song.duration, ctx.beat_duration) + 1
 
     # Find weak sections
-    weak_sections = _identify_weak_sections(song, history, beat_duration)
+    weak_sections = _identify_weak_sections(song, history, ctx)
 
     # Build steps: weak sections first (hands separate, then together)
     for bar_start, bar_end, reason, hand in weak_sections[:max_steps // 2]:
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress, count, islice, pairwise, repeat
+from operator import lt, sub
 
 from keyfall.models import Hand, HitGrade, HitResult
 
@@ -18,41 +21,137 @@ class TechniqueInsight:
     hand: Hand | None = None
 
 
-def _split_by_hand(results: list[HitResult]) -> dict[Hand, list[HitResult]]:
-    """Group results by hand."""
-    by_hand: dict[Hand, list[HitResult]] = {
-        Hand.LEFT: [],
-        Hand.RIGHT: [],
-    }
-    for r in results:
-        hand = r.expected.hand
-        if hand in by_hand:
-            by_hand[hand].append(r)
-        else:
-            # BOTH — attribute to both
-            by_hand[Hand.LEFT].append(r)
-            by_hand[Hand.RIGHT].append(r)
-    return by_hand
+_LEFT, _RIGHT, _BOTH = 0, 1, 2  # hand codes in _ScanState.hit_hands
+
+
+@dataclass
+class _HandColumns:
+    """Parallel columns over one hand's graded hits (non-MISS, with a played pitch)."""
+
+    abs_offsets: array  # |timing_offset_ms|
+    pitches: array  # expected pitch
+    velocities: array  # expected velocity
+    # Welford mean and sum of squared deviations of timing_offset_ms
+    offset_mean: float = 0.0
+    offset_m2: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.abs_offsets)
+
+
+def _welford(values: array) -> tuple[float, float]:
+    """Return (mean, sum of squared deviations) of ``values`` in one pass."""
+    n = 0
+    mean = m2 = 0.0
+    for x in values:
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return mean, m2
+
+
+@dataclass
+class _ScanState:
+    """Everything the detectors need, gathered in a single pass over the results."""
+
+    # Graded hits in order, as parallel columns
+    hit_offsets: array = field(default_factory=lambda: array("d"))
+    hit_pitches: array = field(default_factory=lambda: array("b"))
+    hit_velocities: array = field(default_factory=lambda: array("b"))
+    hit_hands: array = field(default_factory=lambda: array("b"))
+    soft_hits: int = 0  # graded hits with expected velocity < 60
+    soft_struggles: int = 0  # ... of which graded OK
+    loud_hits: int = 0  # graded hits with expected velocity > 100
+    loud_struggles: int = 0
+    short_notes: int = 0  # all results with duration < 0.2s
+    short_misses: int = 0
+
+    def hand_columns(self, hand: Hand) -> _HandColumns:
+        """Select one hand's hits (BOTH notes count for each hand)."""
+        other = _RIGHT if hand is Hand.LEFT else _LEFT
+        mask = array("b", map(other.__ne__, self.hit_hands))
+        offsets = array("d", compress(self.hit_offsets, mask))
+        mean, m2 = _welford(offsets)
+        return _HandColumns(
+            abs_offsets=array("d", map(abs, offsets)),
+            pitches=array("b", compress(self.hit_pitches, mask)),
+            velocities=array("b", compress(self.hit_velocities, mask)),
+            offset_mean=mean,
+            offset_m2=m2,
+        )
 
 
-def _detect_timing_drift(results: list[HitResult], hand: Hand) -> TechniqueInsight | None:
+def _scan(results: list[HitResult]) -> _ScanState:
+    """Walk the results once, unpacking graded hits into columns and counting the rest.
+
+    The loop only appends scalars and bumps counters; the per-hand split
+    and the statistics run afterwards over the flat columns.
+    """
+    state = _ScanState()
+    # Locals for the enum members and bound appends the loop uses per result
+    miss, ok = HitGrade.MISS, HitGrade.OK
+    left, right = Hand.LEFT, Hand.RIGHT
+    add_offset = state.hit_offsets.append
+    add_pitch = state.hit_pitches.append
+    add_velocity = state.hit_velocities.append
+    add_hand = state.hit_hands.append
+    short_notes = short_misses = 0
+    soft_hits = soft_struggles = loud_hits = loud_struggles = 0
+
+    for r in results:
+        expected = r.expected
+        grade = r.grade
+        missed = grade is miss
+        if expected.duration < 0.2:
+            short_notes += 1
+            if missed:
+                short_misses += 1
+
+        # Only graded hits (not MISS, with a played pitch) feed the rest
+        if missed or r.played_pitch is None:
+            continue
+
+        hand = expected.hand
+        velocity = expected.velocity
+        add_offset(r.timing_offset_ms)
+        add_pitch(expected.pitch)
+        add_velocity(velocity)
+        add_hand(_LEFT if hand is left else _RIGHT if hand is right else _BOTH)
+
+        # Group notes into soft (velocity < 60) and loud (velocity > 100).
+        # MISS never reaches here, so struggling means an OK grade.
+        if velocity < 60:
+            soft_hits += 1
+            if grade is ok:
+                soft_struggles += 1
+        elif velocity > 100:
+            loud_hits += 1
+            if grade is ok:
+                loud_struggles += 1
+
+    state.short_notes, state.short_misses = short_notes, short_misses
+    state.soft_hits, state.soft_struggles = soft_hits, soft_struggles
+    state.loud_hits, state.loud_struggles = loud_hits, loud_struggles
+    return state
+
+
+def _detect_timing_drift(hits: _HandColumns, hand: Hand) -> TechniqueInsight | None:
     """Detect systematic early/late tendency using mean offset.
 
     If a hand is consistently >15ms early or late across 10+ notes,
     flag it as a timing drift issue.
     """
-    hits = [r for r in results if r.grade != HitGrade.MISS and r.played_pitch is not None]
     if len(hits) < 10:
         return None
 
-    offsets = [r.timing_offset_ms for r in hits]
-    mean_offset = sum(offsets) / len(offsets)
+    mean_offset = hits.offset_mean
 
     if abs(mean_offset) < 15.0:
         return None
 
     direction = "early" if mean_offset < 0 else "late"
-    hand_name = "Left hand" if hand == Hand.LEFT else "Right hand"
+    hand_name = "Left hand" if hand is Hand.LEFT else "Right hand"
 
     return TechniqueInsight(
         category="timing",
@@ -62,21 +161,17 @@ def _detect_timing_drift(results: list[HitResult], hand: Hand) -> TechniqueInsig
     )
 
 
-def _detect_timing_variance(results: list[HitResult], hand: Hand) -> TechniqueInsight | None:
+def _detect_timing_variance(hits: _HandColumns, hand: Hand) -> TechniqueInsight | None:
     """Detect inconsistent timing (high variance even if mean is centered)."""
-    hits = [r for r in results if r.grade != HitGrade.MISS and r.played_pitch is not None]
     if len(hits) < 10:
         return None
 
-    offsets = [r.timing_offset_ms for r in hits]
-    mean = sum(offsets) / len(offsets)
-    variance = sum((o - mean) ** 2 for o in offsets) / len(offsets)
-    std_dev = variance ** 0.5
+    std_dev = (hits.offset_m2 / len(hits)) ** 0.5
 
     if std_dev < 30.0:
         return None
 
-    hand_name = "Left hand" if hand == Hand.LEFT else "Right hand"
+    hand_name = "Left hand" if hand is Hand.LEFT else "Right hand"
 
     return TechniqueInsight(
         category="timing",
@@ -86,19 +181,19 @@ def _detect_timing_variance(results: list[HitResult], hand: Hand) -> TechniqueIn
     )
 
 
-def _detect_rush_or_drag(results: list[HitResult]) -> TechniqueInsight | None:
+def _detect_rush_or_drag(state: _ScanState) -> TechniqueInsight | None:
     """Detect accelerando/ritardando tendency across the session.
 
     Compare average timing offset in the first half vs second half.
     If the second half is significantly earlier, the player is rushing.
     """
-    hits = [r for r in results if r.grade != HitGrade.MISS and r.played_pitch is not None]
-    if len(hits) < 20:
+    offsets = state.hit_offsets
+    if len(offsets) < 20:
         return None
 
-    mid = len(hits) // 2
-    first_half_mean = sum(r.timing_offset_ms for r in hits[:mid]) / mid
-    second_half_mean = sum(r.timing_offset_ms for r in hits[mid:]) / (len(hits) - mid)
+    mid = len(offsets) // 2
+    first_half_mean = sum(offsets[:mid]) / mid
+    second_half_mean = sum(offsets[mid:]) / (len(offsets) - mid)
 
     drift = second_half_mean - first_half_mean
 
@@ -119,24 +214,19 @@ def _detect_rush_or_drag(results: list[HitResult]) -> TechniqueInsight | None:
         )
 
 
-def _detect_dynamic_mismatch(results: list[HitResult]) -> list[TechniqueInsight]:
+def _detect_dynamic_mismatch(state: _ScanState) -> list[TechniqueInsight]:
     """Detect velocity mismatches — too loud in soft passages or vice versa.
 
     Compares expected velocity to played velocity (approximated from
     the expected note's velocity as the target dynamic).
     """
     insights: list[TechniqueInsight] = []
-    hits = [r for r in results if r.grade != HitGrade.MISS and r.played_pitch is not None]
-    if len(hits) < 5:
+    if len(state.hit_offsets) < 5:
         return insights
 
-    # Group notes into soft (velocity < 60) and loud (velocity > 100)
-    soft_notes = [r for r in hits if r.expected.velocity < 60]
-    loud_notes = [r for r in hits if r.expected.velocity > 100]
-
     # Check if soft passages have too many missed/OK grades (suggests pounding)
-    if len(soft_notes) >= 5:
-        soft_miss_rate = sum(1 for r in soft_notes if r.grade in (HitGrade.OK, HitGrade.MISS)) / len(soft_notes)
+    if state.soft_hits >= 5:
+        soft_miss_rate = state.soft_struggles / state.soft_hits
         if soft_miss_rate > 0.3:
             insights.append(
                 TechniqueInsight(
@@ -146,8 +236,8 @@ def _detect_dynamic_mismatch(results: list[HitResult]) -> list[TechniqueInsight]
                 )
             )
 
-    if len(loud_notes) >= 5:
-        loud_miss_rate = sum(1 for r in loud_notes if r.grade in (HitGrade.OK, HitGrade.MISS)) / len(loud_notes)
+    if state.loud_hits >= 5:
+        loud_miss_rate = state.loud_struggles / state.loud_hits
         if loud_miss_rate > 0.3:
             insights.append(
                 TechniqueInsight(
@@ -160,46 +250,34 @@ def _detect_dynamic_mismatch(results: list[HitResult]) -> list[TechniqueInsight]
     return insights
 
 
-def _detect_uneven_fingers(results: list[HitResult], hand: Hand) -> TechniqueInsight | None:
+def _detect_uneven_fingers(hits: _HandColumns, hand: Hand) -> TechniqueInsight | None:
     """Detect uneven velocity in scale/run passages.
 
     Look for sequences of 5+ consecutive notes with small intervals (1-2 semitones)
     and check if velocity varies more than expected.
     """
-    hits = [r for r in results if r.grade != HitGrade.MISS and r.played_pitch is not None]
     if len(hits) < 8:
         return None
 
-    # Find runs: sequences where each note is 1-2 semitones from the previous
-    run_start = 0
-    runs: list[list[HitResult]] = []
-
-    for i in range(1, len(hits)):
-        interval = abs(hits[i].expected.pitch - hits[i - 1].expected.pitch)
-        if interval > 2:
-            if i - run_start >= 5:
-                runs.append(hits[run_start:i])
-            run_start = i
-
-    if len(hits) - run_start >= 5:
-        runs.append(hits[run_start:])
+    # Find runs: sequences where each note is 1-2 semitones from the previous.
+    # A run breaks at every index whose step from the previous note exceeds 2.
+    pitches = hits.pitches
+    steps = map(abs, map(sub, islice(pitches, 1, None), pitches))
+    breaks = compress(count(1), map(lt, repeat(2), steps))
+    bounds = [0, *breaks, len(pitches)]
+    runs = [(lo, hi) for lo, hi in pairwise(bounds) if hi - lo >= 5]
 
     if not runs:
         return None
 
-    # Check velocity variance within runs
-    for run in runs:
-        velocities = [r.expected.velocity for r in run]
-        mean_vel = sum(velocities) / len(velocities)
-        if mean_vel == 0:
+    for lo, hi in runs:
+        if not any(hits.velocities[lo:hi]):
             continue
-        variance = sum((v - mean_vel) ** 2 for v in velocities) / len(velocities)
         # Check timing variance instead (what we can actually measure)
-        timing_offsets = [abs(r.timing_offset_ms) for r in run]
-        mean_timing = sum(timing_offsets) / len(timing_offsets)
+        mean_timing = sum(hits.abs_offsets[lo:hi]) / (hi - lo)
 
         if mean_timing > 40.0:
-            hand_name = "Left hand" if hand == Hand.LEFT else "Right hand"
+            hand_name = "Left hand" if hand is Hand.LEFT else "Right hand"
             return TechniqueInsight(
                 category="evenness",
                 severity=min(1.0, mean_timing / 100.0),
@@ -210,18 +288,17 @@ def _detect_uneven_fingers(results: list[HitResult], hand: Hand) -> TechniqueIns
     return None
 
 
-def _detect_articulation_errors(results: list[HitResult]) -> TechniqueInsight | None:
+def _detect_articulation_errors(state: _ScanState) -> TechniqueInsight | None:
     """Detect articulation issues by checking for patterns of OK/MISS
     grades in passages with short note durations (staccato) vs long (legato).
 
     Short notes (<0.2s) that are graded MISS often indicate the player
     is holding too long (playing legato instead of staccato).
     """
-    short_notes = [r for r in results if r.expected.duration < 0.2]
-    if len(short_notes) < 5:
+    if state.short_notes < 5:
         return None
 
-    miss_rate = sum(1 for r in short_notes if r.grade == HitGrade.MISS) / len(short_notes)
+    miss_rate = state.short_misses / state.short_notes
     if miss_rate > 0.4:
         return TechniqueInsight(
             category="articulation",
@@ -246,33 +323,33 @@ def analyze(results: list[HitResult]) -> list[TechniqueInsight]:
 
     insights: list[TechniqueInsight] = []
 
+    state = _scan(results)
+
     # Per-hand analysis
-    by_hand = _split_by_hand(results)
-    for hand, hand_results in by_hand.items():
-        if not hand_results:
-            continue
+    for hand in (Hand.LEFT, Hand.RIGHT):
+        hits = state.hand_columns(hand)
 
-        drift = _detect_timing_drift(hand_results, hand)
+        drift = _detect_timing_drift(hits, hand)
         if drift:
             insights.append(drift)
 
-        variance = _detect_timing_variance(hand_results, hand)
+        variance = _detect_timing_variance(hits, hand)
         if variance:
             insights.append(variance)
 
-        evenness = _detect_uneven_fingers(hand_results, hand)
+        evenness = _detect_uneven_fingers(hits, hand)
         if evenness:
             insights.append(evenness)
 
     # Whole-session analysis
-    rush_drag = _detect_rush_or_drag(results)
+    rush_drag = _detect_rush_or_drag(state)
     if rush_drag:
         insights.append(rush_drag)
 
-    dynamics = _detect_dynamic_mismatch(results)
+    dynamics = _detect_dynamic_mismatch(state)
     insights.extend(dynamics)
 
-    articulation = _detect_articulation_errors(results)
+    articulation = _detect_articulation_errors(state)
     if articulation:
         insights.append(articulation)
 
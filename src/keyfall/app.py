@@ -6,7 +6,7 @@ import pygame
 
 from keyfall.config import FPS, WINDOW_HEIGHT, WINDOW_TITLE, WINDOW_WIDTH
 from keyfall.midi_input import KeyboardInput
-from keyfall.views.base import ViewContext, ViewManager
+from keyfall.views.base import REDRAW_EVENTS, ViewContext, ViewManager
 from keyfall.views.freeplay_view import FreePlayView
 from keyfall.views.menu_view import MenuView
 from keyfall.views.practice_view import PracticeView
@@ -57,18 +57,28 @@ class App:
         running = True
         while running:
             dt = self.clock.tick(FPS) / 1000.0
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                else:
-                    self._keyboard_input.feed_event(event)
-                    if not self.views.handle_event(event):
-                        running = False
+            events = pygame.event.get()
+            batch = [event for event in events if event.type != pygame.QUIT]
+            if len(batch) != len(events):
+                running = False
+            feed_event = self._keyboard_input.feed_event
+            for event in batch:
+                feed_event(event)
+            if not self.views.handle_event_batch(batch):
+                running = False
             if running:
                 if not self.views.update(dt):
                     running = False
-            self.views.draw(self.screen)
-            pygame.display.flip()
+            # After the window is uncovered or restored, nothing on screen can
+            # be trusted: have the view redraw in full and push all of it
+            exposed = any(event.type in REDRAW_EVENTS for event in batch)
+            if exposed:
+                self.views.invalidate()
+            dirty = self.views.draw(self.screen)
+            if dirty is None or exposed:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
 
         self._cleanup()
         pygame.quit()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import heapq
 import sys
 import time
 from pathlib import Path
@@ -25,11 +26,23 @@ def _detect_audio_driver() -> str:
 class AudioEngine:
     """Wraps FluidSynth for low-latency audio playback."""
 
-    def __init__(self, soundfont_path: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        soundfont_path: str | Path | None = None,
+        sweep_note_offs: bool = False,
+    ) -> None:
         self.fs = fluidsynth.Synth(gain=0.8)
+        # Also send a note-off per pitch in all_notes_off(), for SoundFonts
+        # that ignore the channel-mode messages
+        self.sweep_note_offs = sweep_note_offs
         self.fs.start(driver=_detect_audio_driver())
         self._sfid: int | None = None
-        self._pending_offs: list[tuple[float, int, int]] = []  # (off_time, pitch, channel)
+        # FluidSynth's own sequencer (ticks are ms), for notes timed ahead of the frame loop
+        self._sequencer = fluidsynth.Sequencer(time_scale=1000)
+        self._sequencer_dest = self._sequencer.register_fluidsynth(self.fs)
+        self._sequencer_busy_until = 0  # tick of the last queued note-off
+        # Heap of (off_time, pitch, channel), earliest release first
+        self._pending_offs: list[tuple[float, int, int]] = []
         if soundfont_path:
             self.load_soundfont(soundfont_path)
 
@@ -43,21 +56,53 @@ class AudioEngine:
     def note_off(self, pitch: int, channel: int = 0) -> None:
         self.fs.noteoff(channel, pitch)
 
+    def play_notes(self, notes: list[tuple[int, int]], channel: int = 0) -> None:
+        """Sound a batch of (pitch, velocity) in order; velocity 0 releases the pitch.
+
+        Views collect a frame's live input and hand it over in one call, so
+        an on/off pair for the same key within a frame keeps its order.
+        """
+        noteon, noteoff = self.fs.noteon, self.fs.noteoff
+        for pitch, velocity in notes:
+            if velocity:
+                noteon(channel, pitch, velocity)
+            else:
+                noteoff(channel, pitch)
+
     def play_note_event(self, note: NoteEvent, channel: int = 0) -> None:
         self.fs.noteon(channel, note.pitch, note.velocity)
-        off_time = time.time() + note.duration
-        self._pending_offs.append((off_time, note.pitch, channel))
+        off_time = time.perf_counter() + note.duration
+        heapq.heappush(self._pending_offs, (off_time, note.pitch, channel))
+
+    def schedule_note_event(self, note: NoteEvent, delay: float, channel: int = 0) -> None:
+        """Play a note ``delay`` seconds from now, timed by the synth's sequencer clock."""
+        seq = self._sequencer
+        start = seq.get_tick() + max(0, round(delay * 1000))
+        duration = max(1, round(note.duration * 1000))
+        seq.note(start, channel, note.pitch, note.velocity, duration, dest=self._sequencer_dest)
+        self._sequencer_busy_until = max(self._sequencer_busy_until, start + duration)
+
+    def _drop_scheduled(self) -> None:
+        """Discard the note-ons and note-offs still queued in the sequencer.
+
+        pyfluidsynth doesn't wrap fluid_sequencer_remove_events, so a
+        sequencer with events left in it is replaced by a fresh one.
+        """
+        seq = self._sequencer
+        if seq.get_tick() >= self._sequencer_busy_until:
+            return
+        seq.delete()
+        self._sequencer = fluidsynth.Sequencer(time_scale=1000)
+        self._sequencer_dest = self._sequencer.register_fluidsynth(self.fs)
+        self._sequencer_busy_until = 0
 
     def flush_pending_offs(self) -> None:
         """Call each frame to release notes whose duration has elapsed."""
-        now = time.time()
-        remaining: list[tuple[float, int, int]] = []
-        for off_time, pitch, channel in self._pending_offs:
-            if now >= off_time:
-                self.fs.noteoff(channel, pitch)
-            else:
-                remaining.append((off_time, pitch, channel))
-        self._pending_offs = remaining
+        now = time.perf_counter()
+        pending = self._pending_offs
+        while pending and pending[0][0] <= now:
+            _, pitch, channel = heapq.heappop(pending)
+            self.fs.noteoff(channel, pitch)
 
     def set_instrument(self, channel: int, program: int) -> None:
         """Change the MIDI program (instrument) on a channel."""
@@ -70,11 +115,17 @@ class AudioEngine:
         self.fs.cc(channel, 7, cc_value)
 
     def all_notes_off(self) -> None:
+        """Silence every channel, including notes queued by schedule_note_event()."""
+        self._drop_scheduled()
         for ch in range(16):
-            for pitch in range(128):
-                self.fs.noteoff(ch, pitch)
-        self._pending_offs.clear()
+            self.fs.cc(ch, 120, 0)  # All Sound Off
+            self.fs.cc(ch, 123, 0)  # All Notes Off
+            if self.sweep_note_offs:
+                for pitch in range(128):
+                    self.fs.noteoff(ch, pitch)
+        self._pending_offs = []
 
     def shutdown(self) -> None:
         self.all_notes_off()
+        self._sequencer.delete()
         self.fs.delete()
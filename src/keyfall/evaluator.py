@@ -2,66 +2,179 @@
 
 from __future__ import annotations
 
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+
 from keyfall.config import GOOD_WINDOW_MS, OK_WINDOW_MS, PERFECT_WINDOW_MS
 from keyfall.models import HitGrade, HitResult, NoteEvent, SessionStats
 
+OK_WINDOW_S = OK_WINDOW_MS / 1000.0
+
+# Timing bins: bisect_left(_WINDOW_EDGES_MS, |offset_ms|) indexes _GRADE_BY_BIN.
+# This is the one definition of the grading windows.
+_WINDOW_EDGES_MS = (PERFECT_WINDOW_MS, GOOD_WINDOW_MS, OK_WINDOW_MS)
+_GRADE_BY_BIN = (HitGrade.PERFECT, HitGrade.GOOD, HitGrade.OK, HitGrade.MISS)
+
+
+def evaluate_hit_timing(note_start: float, played_time: float) -> HitGrade:
+    """Grade a hit whose pitch is already known to match, from its timing alone.
+
+    Gives the same grade as evaluate_hit() for a matching pitch, without
+    the pitch check or building a HitResult.
+    """
+    return _GRADE_BY_BIN[bisect_left(_WINDOW_EDGES_MS, abs((played_time - note_start) * 1000.0))]
 
-def evaluate_hit(
-    expected: NoteEvent,
-    played_pitch: int,
-    played_time: float,
-) -> HitResult:
-    """Grade a single note hit based on pitch match and timing offset."""
-    offset_ms = (played_time - expected.start_time) * 1000.0
 
-    if played_pitch != expected.pitch:
-        return HitResult(
+def _make_evaluate_hit():
+    # Closure cells, so the hot path reads them without global lookups
+    grade_timing = evaluate_hit_timing
+    miss = HitGrade.MISS
+    hit_result = HitResult
+
+    def evaluate_hit(expected: NoteEvent, played_pitch: int, played_time: float) -> HitResult:
+        """Grade a single note hit based on pitch match and timing offset."""
+        note_start = expected.start_time
+        if played_pitch == expected.pitch:
+            grade = grade_timing(note_start, played_time)
+        else:
+            grade = miss
+        return hit_result(
             expected=expected,
             played_pitch=played_pitch,
-            grade=HitGrade.MISS,
-            timing_offset_ms=offset_ms,
+            grade=grade,
+            timing_offset_ms=(played_time - note_start) * 1000.0,
         )
 
-    abs_offset = abs(offset_ms)
-    if abs_offset <= PERFECT_WINDOW_MS:
-        grade = HitGrade.PERFECT
-    elif abs_offset <= GOOD_WINDOW_MS:
-        grade = HitGrade.GOOD
-    elif abs_offset <= OK_WINDOW_MS:
-        grade = HitGrade.OK
-    else:
-        grade = HitGrade.MISS
+    return evaluate_hit
+
+
+evaluate_hit = _make_evaluate_hit()
+
+
+def evaluate_hits(
+    expected: list[NoteEvent],
+    played_pitches: list[int],
+    played_times: list[float],
+) -> list[HitResult]:
+    """Grade a batch of hits at once.
+
+    Equivalent to calling evaluate_hit() on each (expected, pitch, time)
+    triple, with the timing table bound once for the whole batch.
+    """
+    edges = _WINDOW_EDGES_MS
+    grade_by_bin = _GRADE_BY_BIN
+    miss = HitGrade.MISS
+    results: list[HitResult] = []
+    for note, pitch, played_time in zip(expected, played_pitches, played_times, strict=True):
+        offset_ms = (played_time - note.start_time) * 1000.0
+        if pitch == note.pitch:
+            grade = grade_by_bin[bisect_left(edges, abs(offset_ms))]
+        else:
+            grade = miss
+        results.append(HitResult(
+            expected=note,
+            played_pitch=pitch,
+            grade=grade,
+            timing_offset_ms=offset_ms,
+        ))
+    return results
+
+
+def sweep_pending(
+    pending: list[NoteEvent],
+    pressed: int,
+    position: float,
+    streak: int,
+    expiry: float = 0.3,
+) -> tuple[list[int], int, int]:
+    """Resolve a view's pending notes against the held keys, in one pass.
 
-    return HitResult(
-        expected=expected,
-        played_pitch=played_pitch,
-        grade=grade,
-        timing_offset_ms=offset_ms,
-    )
+    ``pressed`` is a bitmask of held pitches (bit ``p`` for pitch ``p``).
+    Notes older than ``expiry`` seconds count as MISS, notes whose pitch is
+    held are graded at ``position``, and the rest stay in ``pending``, which
+    is compacted in place in their original order.
+
+    Returns ``(counts, streak, peak)``: the resolved notes per grade indexed
+    by ``HitGrade.value - 1``, the streak after the sweep, and the highest
+    streak reached during it.
+    """
+    counts = [0, 0, 0, 0]
+    peak = 0
+    grade_timing = evaluate_hit_timing
+    miss = HitGrade.MISS
+    # Notes join the queue in start order, so the expired ones normally form
+    # a run at the head; settle that run in one step before the sweep
+    stale = 0
+    for note in pending:
+        if position - note.start_time <= expiry:
+            break
+        stale += 1
+    if stale:
+        del pending[:stale]
+        counts[3] = stale
+        streak = 0
+
+    kept = 0
+    for note in pending:
+        if position - note.start_time > expiry:
+            counts[3] += 1
+            streak = 0
+        elif pressed >> note.pitch & 1:
+            # The held pitch is the note's own, so only the timing decides the grade
+            grade = grade_timing(note.start_time, position)
+            counts[grade.value - 1] += 1
+            if grade is miss:
+                streak = 0
+            else:
+                streak += 1
+                if streak > peak:
+                    peak = streak
+        else:
+            pending[kept] = note
+            kept += 1
+    del pending[kept:]
+    return counts, streak, peak
 
 
 class HitTracker:
     """Stateful evaluator that matches played notes to expected notes and tracks stats."""
 
     def __init__(self, song_notes: list[NoteEvent], song_title: str = "") -> None:
-        self._expected = list(song_notes)
+        self._expected = list(song_notes)  # in start-time order
+        self._start_times = [n.start_time for n in self._expected]
         self._song_title = song_title
-        self._pending: list[tuple[int, NoteEvent]] = []  # (original_index, note)
+        self._pending: dict[int, NoteEvent] = {}  # original_index -> note, in activation order
+        # pitch -> original indices of its pending notes, in activation order
+        self._pending_by_pitch: dict[int, list[int]] = {}
+        # Activated indices in start-time order; matched ones are skipped on flush
+        self._pending_queue: deque[int] = deque()
         self._next_idx = 0
-        self._results: list[HitResult] = []
+        # Recorded results as parallel columns; get_results() rebuilds HitResults
+        self._result_note = array("i")  # index into _expected
+        self._result_pitch = array("h")  # played pitch, -1 for an unplayed MISS
+        self._result_grade = array("b")  # HitGrade.value
+        self._result_offset = array("d")  # timing_offset_ms
         self._streak = 0
         self._max_streak = 0
+        # Results per grade, indexed by HitGrade.value - 1
+        self._grade_counts = [0, 0, 0, 0]
+        # Welford running mean / squared deviations of graded-hit offsets
+        self._n_offsets = 0
+        self._mean_offset = 0.0
+        self._m2_offset = 0.0
 
     def _activate_pending(self, current_time: float) -> None:
         """Move notes within the OK window into the pending set."""
-        window_s = OK_WINDOW_MS / 1000.0
-        while self._next_idx < len(self._expected):
-            note = self._expected[self._next_idx]
-            if note.start_time <= current_time + window_s:
-                self._pending.append((self._next_idx, note))
-                self._next_idx += 1
-            else:
-                break
+        start = self._next_idx
+        end = bisect_right(self._start_times, current_time + OK_WINDOW_S, start)
+        for idx in range(start, end):
+            note = self._expected[idx]
+            self._pending[idx] = note
+            self._pending_by_pitch.setdefault(note.pitch, []).append(idx)
+            self._pending_queue.append(idx)
+        self._next_idx = end
 
     def feed(self, played_pitch: int, played_time: float) -> HitResult | None:
         """Match a played note to the nearest pending expected note.
@@ -70,62 +183,112 @@ class HitTracker:
         """
         self._activate_pending(played_time)
 
-        best_idx: int | None = None
-        best_offset = float("inf")
-
-        for i, (orig_idx, note) in enumerate(self._pending):
-            if note.pitch == played_pitch:
-                offset = abs(played_time - note.start_time)
-                if offset < best_offset:
-                    best_offset = offset
-                    best_idx = i
-
-        if best_idx is None:
+        # Only same-pitch notes can match; usually there is just one
+        candidates = self._pending_by_pitch.get(played_pitch)
+        if not candidates:
             return None
 
-        _, note = self._pending.pop(best_idx)
+        pending = self._pending
+        best_idx = 0
+        best_offset = float("inf")
+        for i, orig_idx in enumerate(candidates):
+            offset = abs(played_time - pending[orig_idx].start_time)
+            if offset < best_offset:
+                best_offset = offset
+                best_idx = i
+
+        orig_idx = candidates.pop(best_idx)
+        note = pending.pop(orig_idx)
         result = evaluate_hit(note, played_pitch, played_time)
-        self._record(result)
+        self._record(orig_idx, result)
         return result
 
     def flush_misses(self, current_time: float) -> list[HitResult]:
         """Mark any pending notes whose window has fully passed as MISS."""
         self._activate_pending(current_time)
-        window_s = OK_WINDOW_MS / 1000.0
         missed: list[HitResult] = []
-        remaining: list[tuple[int, NoteEvent]] = []
-
-        for orig_idx, note in self._pending:
-            if current_time - note.start_time > window_s:
-                result = HitResult(
-                    expected=note,
-                    played_pitch=None,
-                    grade=HitGrade.MISS,
-                    timing_offset_ms=(current_time - note.start_time) * 1000.0,
-                )
-                self._record(result)
-                missed.append(result)
-            else:
-                remaining.append((orig_idx, note))
+        pending = self._pending
+        queue = self._pending_queue
+
+        # Notes expire in start-time order, so stop at the first one still live
+        while queue:
+            orig_idx = queue[0]
+            note = pending.get(orig_idx)
+            if note is None:
+                queue.popleft()  # already matched by feed()
+                continue
+            if current_time - note.start_time <= OK_WINDOW_S:
+                break
+            queue.popleft()
+            del pending[orig_idx]
+            self._pending_by_pitch[note.pitch].remove(orig_idx)
+            result = HitResult(
+                expected=note,
+                played_pitch=None,
+                grade=HitGrade.MISS,
+                timing_offset_ms=(current_time - note.start_time) * 1000.0,
+            )
+            self._record(orig_idx, result)
+            missed.append(result)
 
-        self._pending = remaining
         return missed
 
-    def _record(self, result: HitResult) -> None:
-        self._results.append(result)
+    def _record(self, note_idx: int, result: HitResult) -> None:
+        played_pitch = result.played_pitch
+        grade_code = result.grade.value
+        self._result_note.append(note_idx)
+        self._result_pitch.append(-1 if played_pitch is None else played_pitch)
+        self._result_grade.append(grade_code)
+        self._result_offset.append(result.timing_offset_ms)
+        self._grade_counts[grade_code - 1] += 1
         if result.grade != HitGrade.MISS:
+            offset = result.timing_offset_ms
+            self._n_offsets += 1
+            delta = offset - self._mean_offset
+            self._mean_offset += delta / self._n_offsets
+            self._m2_offset += delta * (offset - self._mean_offset)
             self._streak += 1
-            self._max_streak = max(self._max_streak, self._streak)
+            if self._streak > self._max_streak:
+                self._max_streak = self._streak
         else:
             self._streak = 0
 
+    def get_results(self) -> list[HitResult]:
+        """Return every recorded result, in the order it was recorded."""
+        expected = self._expected
+        return [
+            HitResult(
+                expected=expected[note_idx],
+                played_pitch=None if pitch < 0 else pitch,
+                grade=HitGrade(grade_code),
+                timing_offset_ms=offset,
+            )
+            for note_idx, pitch, grade_code, offset in zip(
+                self._result_note, self._result_pitch,
+                self._result_grade, self._result_offset,
+            )
+        ]
+
+    @property
+    def mean_timing_offset_ms(self) -> float:
+        """Mean timing offset of the graded (non-MISS) hits so far."""
+        return self._mean_offset
+
+    @property
+    def std_timing_offset_ms(self) -> float:
+        """Population standard deviation of the graded hits' timing offsets."""
+        if self._n_offsets == 0:
+            return 0.0
+        return math.sqrt(self._m2_offset / self._n_offsets)
+
     def get_stats(self) -> SessionStats:
         """Aggregate all results into SessionStats."""
-        perfect = sum(1 for r in self._results if r.grade == HitGrade.PERFECT)
-        good = sum(1 for r in self._results if r.grade == HitGrade.GOOD)
-        ok = sum(1 for r in self._results if r.grade == HitGrade.OK)
-        missed = sum(1 for r in self._results if r.grade == HitGrade.MISS)
-        total = len(self._results)
+        counts = self._grade_counts
+        perfect = counts[HitGrade.PERFECT.value - 1]
+        good = counts[HitGrade.GOOD.value - 1]
+        ok = counts[HitGrade.OK.value - 1]
+        missed = counts[HitGrade.MISS.value - 1]
+        total = len(self._result_grade)
         hits = perfect + good + ok
         accuracy = (hits / total * 100.0) if total > 0 else 0.0
 
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import time
+from operator import itemgetter
 from pathlib import Path
+from time import perf_counter
 
 import mido
 
@@ -27,36 +28,96 @@ _CHORD_TEMPLATES: list[tuple[frozenset[int], str]] = [
 ]
 
 
+# Template pitch classes as 12-bit masks (bit i = interval i above the root)
+_CHORD_TEMPLATE_MASKS: list[tuple[int, int, str]] = [
+    (sum(1 << i for i in template), len(template), suffix)
+    for template, suffix in _CHORD_TEMPLATES
+]
+
+# Templates that can fit within n pitch classes, by n, in template order
+# (so ties still go to the earlier template)
+_CHORD_TEMPLATES_FITTING: list[list[tuple[int, int, str]]] = [
+    [t for t in _CHORD_TEMPLATE_MASKS if t[1] <= n] for n in range(13)
+]
+
+
+# Chord name per pitch-class mask; at most 4096 entries
+_CHORD_CACHE: dict[int, str | None] = {}
+
+
 def detect_chord(pitches: set[int]) -> str | None:
     """Detect chord name from a set of MIDI pitches."""
     if len(pitches) < 2:
         return None
 
-    pitch_classes = frozenset(p % 12 for p in pitches)
-    if len(pitch_classes) < 2:
+    pc_mask = 0
+    for p in pitches:
+        pc_mask |= 1 << (p % 12)
+    return _lookup_chord(pc_mask)
+
+
+def _lookup_chord(pc_mask: int) -> str | None:
+    """Chord name for a 12-bit pitch-class mask, through the cache."""
+    try:
+        return _CHORD_CACHE[pc_mask]
+    except KeyError:
+        chord = _CHORD_CACHE[pc_mask] = _chord_for_mask(pc_mask)
+        return chord
+
+
+def _chord_for_mask(pc_mask: int) -> str | None:
+    """Name the best-matching chord for a 12-bit pitch-class mask."""
+    n_classes = pc_mask.bit_count()
+    if n_classes < 2:
         return None
 
     best_match: str | None = None
     best_score = 0
+    # A template with more classes than are held can never be fully matched
+    templates = _CHORD_TEMPLATES_FITTING[n_classes]
 
     for root in range(12):
-        intervals = frozenset((pc - root) % 12 for pc in pitch_classes)
-        for template, suffix in _CHORD_TEMPLATES:
-            matched = len(intervals & template)
-            unmatched = len(intervals - template)
-            score = matched - unmatched
-            if matched >= len(template) and score > best_score:
+        # Rotate so bit i is the interval i semitones above this root
+        intervals = ((pc_mask >> root) | (pc_mask << (12 - root))) & 0xFFF
+        for template, size, suffix in templates:
+            matched = (intervals & template).bit_count()
+            score = matched - (n_classes - matched)
+            if matched >= size and score > best_score:
                 best_score = score
                 best_match = f"{_NOTE_NAMES[root]}{suffix}"
+                # An exact match scores n_classes, which nothing later can beat
+                if score == n_classes:
+                    return best_match
 
     return best_match
 
 
+def _seed_chord_cache() -> None:
+    """Name every transposition of every template up front; these are the chords played.
+
+    Holding an exact chord is then a single dict lookup. Names still come
+    from _chord_for_mask, so ties between templates spelling the same
+    pitch classes resolve exactly as on a cache miss.
+    """
+    for template, _size, _suffix in _CHORD_TEMPLATE_MASKS:
+        for root in range(12):
+            mask = ((template << root) | (template >> (12 - root))) & 0xFFF
+            if mask not in _CHORD_CACHE:
+                _CHORD_CACHE[mask] = _chord_for_mask(mask)
+
+
+_seed_chord_cache()
+
+
 class FreePlayMode:
     """Standalone free play logic: chord detection, recording, and MIDI export."""
 
     def __init__(self) -> None:
         self._pressed: set[int] = set()
+        # Held pitches per pitch class, and the mask of classes with any held,
+        # kept in step with _pressed so chord lookup needn't rescan it
+        self._pc_counts = [0] * 12
+        self._pc_mask = 0
         self._chord: str | None = None
         self._recording = False
         self._record_start: float = 0.0
@@ -64,20 +125,27 @@ class FreePlayMode:
         self._recorded_notes: list[NoteEvent] = []
 
     def note_on(self, pitch: int, velocity: int = 80) -> None:
-        self._pressed.add(pitch)
-        self._chord = detect_chord(self._pressed)
+        if pitch not in self._pressed:
+            self._pressed.add(pitch)
+            pc = pitch % 12
+            self._pc_counts[pc] += 1
+            self._pc_mask |= 1 << pc
+            self._chord = _lookup_chord(self._pc_mask)
         if self._recording:
-            self._note_ons[pitch] = (time.time() - self._record_start, velocity)
+            self._note_ons[pitch] = (perf_counter() - self._record_start, velocity)
 
     def note_off(self, pitch: int) -> None:
-        self._pressed.discard(pitch)
-        if not self._pressed:
-            self._chord = None
-        else:
-            self._chord = detect_chord(self._pressed)
+        if pitch in self._pressed:
+            self._pressed.remove(pitch)
+            pc = pitch % 12
+            self._pc_counts[pc] -= 1
+            if not self._pc_counts[pc]:
+                self._pc_mask &= ~(1 << pc)
+            # A single pitch class never names a chord, so this is None once released
+            self._chord = _lookup_chord(self._pc_mask)
         if self._recording and pitch in self._note_ons:
             start, vel = self._note_ons.pop(pitch)
-            elapsed = time.time() - self._record_start
+            elapsed = perf_counter() - self._record_start
             self._recorded_notes.append(NoteEvent(
                 pitch=pitch,
                 start_time=start,
@@ -90,7 +158,7 @@ class FreePlayMode:
 
     def start_recording(self) -> None:
         self._recording = True
-        self._record_start = time.time()
+        self._record_start = perf_counter()
         self._note_ons.clear()
         self._recorded_notes.clear()
 
@@ -98,7 +166,7 @@ class FreePlayMode:
         """Stop recording and return the recorded notes as a Song."""
         self._recording = False
         # Close any still-held notes
-        elapsed = time.time() - self._record_start
+        elapsed = perf_counter() - self._record_start
         for pitch, (start, vel) in self._note_ons.items():
             self._recorded_notes.append(NoteEvent(
                 pitch=pitch,
@@ -138,16 +206,18 @@ def export_midi(song: Song, output_path: Path) -> None:
     for note in song.notes:
         events.append((note.start_time, "note_on", note.pitch, note.velocity))
         events.append((note.start_time + note.duration, "note_off", note.pitch, 0))
-    events.sort(key=lambda e: e[0])
+    events.sort(key=itemgetter(0))
 
-    prev_time = 0.0
-    ticks_per_beat = mid.ticks_per_beat
     tempo = 500_000  # 120 BPM
+    # Seconds per tick, the same scale mido.second2tick() divides by
+    tick_scale = tempo * 1e-6 / mid.ticks_per_beat
 
+    prev_time = 0.0
+    append = track.append
+    message = mido.Message
     for t, msg_type, pitch, velocity in events:
-        delta_sec = t - prev_time
-        delta_ticks = int(mido.second2tick(delta_sec, ticks_per_beat, tempo))
-        track.append(mido.Message(msg_type, note=pitch, velocity=velocity, time=delta_ticks))
+        delta_ticks = round((t - prev_time) / tick_scale)
+        append(message(msg_type, note=pitch, velocity=velocity, time=delta_ticks))
         prev_time = t
 
     mid.save(str(output_path))
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import logging
 import time
+from array import array
+from collections import deque
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
-
-import pygame
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 try:
     import rtmidi
@@ -14,12 +15,17 @@ try:
 except ImportError:
     _HAS_RTMIDI = False
 
+if TYPE_CHECKING:
+    import pygame
+
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class LiveNoteEvent:
     pitch: int
     velocity: int
-    timestamp: float
+    timestamp: float  # time.perf_counter() seconds
     is_note_on: bool
 
 
@@ -31,62 +37,115 @@ class MidiDeviceError(Exception):
 class InputSource(Protocol):
     """Common interface for MIDI and keyboard input sources."""
     def poll(self) -> LiveNoteEvent | None: ...
+    def poll_all(self) -> list[LiveNoteEvent]: ...
+    def poll_notes(self) -> list[tuple[int, int]]: ...
     def close(self) -> None: ...
 
 
-# Computer keyboard -> MIDI pitch mapping
-_LOWER_ROW = {
-    pygame.K_z: 60, pygame.K_x: 62, pygame.K_c: 64, pygame.K_v: 65,
-    pygame.K_b: 67, pygame.K_n: 69, pygame.K_m: 71, pygame.K_COMMA: 72,
-    pygame.K_PERIOD: 74, pygame.K_SLASH: 76,
-}
-_MIDDLE_ROW = {
-    pygame.K_a: 61, pygame.K_s: 63, pygame.K_d: 66, pygame.K_f: 68,
-    pygame.K_g: 70, pygame.K_h: 73, pygame.K_j: 75, pygame.K_k: 77,
-    pygame.K_l: 78, pygame.K_SEMICOLON: 80,
-}
-_UPPER_ROW = {
-    pygame.K_q: 72, pygame.K_w: 74, pygame.K_e: 76, pygame.K_r: 77,
-    pygame.K_t: 79, pygame.K_y: 81, pygame.K_u: 83, pygame.K_i: 84,
-    pygame.K_o: 86, pygame.K_p: 88,
-}
-_KEY_TO_PITCH: dict[int, int] = {**_LOWER_ROW, **_MIDDLE_ROW, **_UPPER_ROW}
+# Key code -> MIDI pitch as a flat table, -1 for unmapped keys. Built by the
+# first KeyboardInput, so pygame is only imported when the keyboard is used.
+_PITCH_BY_KEY: array | None = None
+
+
+def _pitch_table() -> array:
+    global _PITCH_BY_KEY
+    if _PITCH_BY_KEY is None:
+        import pygame
+
+        # Computer keyboard -> MIDI pitch mapping
+        lower_row = {
+            pygame.K_z: 60, pygame.K_x: 62, pygame.K_c: 64, pygame.K_v: 65,
+            pygame.K_b: 67, pygame.K_n: 69, pygame.K_m: 71, pygame.K_COMMA: 72,
+            pygame.K_PERIOD: 74, pygame.K_SLASH: 76,
+        }
+        middle_row = {
+            pygame.K_a: 61, pygame.K_s: 63, pygame.K_d: 66, pygame.K_f: 68,
+            pygame.K_g: 70, pygame.K_h: 73, pygame.K_j: 75, pygame.K_k: 77,
+            pygame.K_l: 78, pygame.K_SEMICOLON: 80,
+        }
+        upper_row = {
+            pygame.K_q: 72, pygame.K_w: 74, pygame.K_e: 76, pygame.K_r: 77,
+            pygame.K_t: 79, pygame.K_y: 81, pygame.K_u: 83, pygame.K_i: 84,
+            pygame.K_o: 86, pygame.K_p: 88,
+        }
+        key_to_pitch = {**lower_row, **middle_row, **upper_row}
+        table = array("b", [-1]) * (max(key_to_pitch) + 1)
+        for key, pitch in key_to_pitch.items():
+            table[key] = pitch
+        _PITCH_BY_KEY = table
+    return _PITCH_BY_KEY
+
+
+# Queued input events kept when nothing polls; the oldest are dropped beyond this
+_MAX_QUEUED_EVENTS = 512
 
 
 class KeyboardInput:
     """Fallback input using computer keyboard mapped to piano notes."""
 
     def __init__(self, velocity: int = 80) -> None:
+        import pygame
+
         self._velocity = velocity
-        self._events: list[LiveNoteEvent] = []
-        self._held: set[int] = set()
+        self._pitch_by_key = _pitch_table()
+        self._keydown, self._keyup = pygame.KEYDOWN, pygame.KEYUP
+        self._events: deque[LiveNoteEvent] = deque(maxlen=_MAX_QUEUED_EVENTS)
+        self._held = 0  # bit p set while pitch p is held
+        self._overflow_warned = False
 
     def feed_event(self, event: pygame.event.Event) -> None:
         """Call from the game loop for each pygame event."""
-        if event.type == pygame.KEYDOWN and event.key in _KEY_TO_PITCH:
-            pitch = _KEY_TO_PITCH[event.key]
-            if pitch not in self._held:
-                self._held.add(pitch)
-                self._events.append(LiveNoteEvent(
+        event_type = event.type
+        if event_type != self._keydown and event_type != self._keyup:
+            return
+        key = event.key
+        table = self._pitch_by_key
+        pitch = table[key] if 0 <= key < len(table) else -1
+        if pitch < 0:
+            return
+        if event_type == self._keydown:
+            if not (self._held >> pitch) & 1:
+                self._held |= 1 << pitch
+                self._queue(LiveNoteEvent(
                     pitch=pitch, velocity=self._velocity,
-                    timestamp=time.time(), is_note_on=True,
+                    timestamp=time.perf_counter(), is_note_on=True,
                 ))
-        elif event.type == pygame.KEYUP and event.key in _KEY_TO_PITCH:
-            pitch = _KEY_TO_PITCH[event.key]
-            self._held.discard(pitch)
-            self._events.append(LiveNoteEvent(
+        else:
+            self._held &= ~(1 << pitch)
+            self._queue(LiveNoteEvent(
                 pitch=pitch, velocity=0,
-                timestamp=time.time(), is_note_on=False,
+                timestamp=time.perf_counter(), is_note_on=False,
             ))
 
+    def _queue(self, event: LiveNoteEvent) -> None:
+        if len(self._events) == _MAX_QUEUED_EVENTS and not self._overflow_warned:
+            logger.warning(
+                "Keyboard input queue full (%d events); dropping the oldest",
+                _MAX_QUEUED_EVENTS,
+            )
+            self._overflow_warned = True
+        self._events.append(event)
+
     def poll(self) -> LiveNoteEvent | None:
         if self._events:
-            return self._events.pop(0)
+            return self._events.popleft()
         return None
 
+    def poll_all(self) -> list[LiveNoteEvent]:
+        """Return and clear every queued event, oldest first."""
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    def poll_notes(self) -> list[tuple[int, int]]:
+        """Like poll_all(), as (pitch, velocity) pairs with velocity 0 for a release."""
+        notes = [(event.pitch, event.velocity) for event in self._events]
+        self._events.clear()
+        return notes
+
     def close(self) -> None:
         self._events.clear()
-        self._held.clear()
+        self._held = 0
 
 
 class MidiInput:
@@ -96,6 +155,16 @@ class MidiInput:
         self.midi_in = rtmidi.MidiIn()
         self._port_index = port_index
         self._open = False
+        # Filled by the rtmidi callback thread, drained by the game loop.
+        # deque append/popleft are atomic, so one producer and one consumer
+        # need no lock. Entries are raw (pitch, velocity, timestamp, is_note_on)
+        # tuples; the LiveNoteEvent is only built when the game loop polls.
+        self._events: deque[tuple[int, int, float, bool]] = deque(maxlen=_MAX_QUEUED_EVENTS)
+        self._dropped = 0  # oldest events evicted from a full queue
+        self._overflow_warned = False
+        # perf_counter() time of the first message, and rtmidi delta time summed since
+        self._anchor: float | None = None
+        self._elapsed = 0.0
 
     @staticmethod
     def list_ports() -> list[str]:
@@ -109,25 +178,69 @@ class MidiInput:
         if not ports:
             raise MidiDeviceError("No MIDI input devices found")
         idx = self._port_index if self._port_index is not None else 0
+        self._anchor = None
+        self._elapsed = 0.0
         self.midi_in.open_port(idx)
+        self.midi_in.set_callback(self._on_message)
         self._open = True
 
+    def _on_message(self, message: tuple[list[int], float], _data: object = None) -> None:
+        """rtmidi callback: timestamp and queue note events as they arrive."""
+        data, delta = message
+        if self._anchor is None:
+            self._anchor = time.perf_counter()
+        else:
+            self._elapsed += delta
+        entry = self._decode(data, self._anchor + self._elapsed)
+        if entry is not None:
+            if len(self._events) == _MAX_QUEUED_EVENTS:
+                self._dropped += 1
+            self._events.append(entry)
+
     def poll(self) -> LiveNoteEvent | None:
-        """Non-blocking poll for the next MIDI message. Returns None if no message."""
-        if not self._open:
-            return None
-        msg = self.midi_in.get_message()
-        if msg is None:
-            return None
-        data, _delta = msg
+        """Non-blocking poll for the next MIDI note event. Returns None if there is none."""
+        if self._events:
+            return LiveNoteEvent(*self._events.popleft())
+        return None
+
+    def poll_all(self) -> list[LiveNoteEvent]:
+        """Return every note event received since the last poll, oldest first."""
+        return [LiveNoteEvent(*entry) for entry in self._drain()]
+
+    def poll_notes(self) -> list[tuple[int, int]]:
+        """Like poll_all(), as (pitch, velocity) pairs with velocity 0 for a release.
+
+        The pairs are taken straight from the queued entries, so no
+        LiveNoteEvent is built; the list can go as is to AudioEngine.play_notes().
+        """
+        return [(entry[0], entry[1]) for entry in self._drain()]
+
+    def _drain(self) -> list[tuple[int, int, float, bool]]:
+        """Pop every queued entry, oldest first."""
+        if self._dropped and not self._overflow_warned:
+            logger.warning("MIDI input overflow: %d events dropped", self._dropped)
+            self._overflow_warned = True
+        entries: list[tuple[int, int, float, bool]] = []
+        queue = self._events
+        popleft = queue.popleft
+        # Pop rather than copy-and-clear, so events the callback appends meanwhile stay queued
+        while queue:
+            entries.append(popleft())
+        return entries
+
+    @staticmethod
+    def _decode(data: list[int], timestamp: float) -> tuple[int, int, float, bool] | None:
+        """Turn raw note-on / note-off bytes into a queue entry; None otherwise."""
         status = data[0] & 0xF0
         if status == 0x90 and data[2] > 0:
-            return LiveNoteEvent(pitch=data[1], velocity=data[2], timestamp=time.time(), is_note_on=True)
+            return (data[1], data[2], timestamp, True)
         elif status == 0x80 or (status == 0x90 and data[2] == 0):
-            return LiveNoteEvent(pitch=data[1], velocity=0, timestamp=time.time(), is_note_on=False)
+            return (data[1], 0, timestamp, False)
         return None
 
     def close(self) -> None:
         if self._open:
+            self.midi_in.cancel_callback()
             self.midi_in.close_port()
             self._open = False
+        self._events.clear()
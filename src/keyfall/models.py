@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum, auto
+from itertools import compress
 
 
 class HitGrade(Enum):
@@ -19,7 +21,7 @@ class Hand(Enum):
     BOTH = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class NoteEvent:
     """A single note in a song or from player input."""
 
@@ -44,6 +46,63 @@ class TimeSignature:
     denominator: int
 
 
+# Hand codes stored in NoteColumns.hand
+HAND_CODES: dict[Hand, int] = {Hand.LEFT: 0, Hand.RIGHT: 1, Hand.BOTH: 2}
+
+
+@dataclass
+class NoteColumns:
+    """A song's notes as parallel typed arrays, index-aligned with Song.notes."""
+
+    start_time: array
+    duration: array
+    pitch: array
+    velocity: array
+    hand: array  # HAND_CODES values
+    track: array
+    max_duration: float = 0.0
+
+    @classmethod
+    def from_notes(cls, notes: list[NoteEvent]) -> NoteColumns:
+        durations = array("d", [n.duration for n in notes])
+        return cls(
+            start_time=array("d", [n.start_time for n in notes]),
+            duration=durations,
+            pitch=array("b", [n.pitch for n in notes]),
+            velocity=array("B", [n.velocity for n in notes]),
+            hand=array("b", [HAND_CODES[n.hand] for n in notes]),
+            track=array("h", [n.track for n in notes]),
+            max_duration=max(durations, default=0.0),
+        )
+
+    def compress(self, selectors) -> NoteColumns:
+        """Columns of the notes whose selector is true, as for itertools.compress."""
+        selectors = list(selectors)
+        durations = array("d", compress(self.duration, selectors))
+        return NoteColumns(
+            start_time=array("d", compress(self.start_time, selectors)),
+            duration=durations,
+            pitch=array("b", compress(self.pitch, selectors)),
+            velocity=array("B", compress(self.velocity, selectors)),
+            hand=array("b", compress(self.hand, selectors)),
+            track=array("h", compress(self.track, selectors)),
+            max_duration=max(durations, default=0.0),
+        )
+
+    def window(self, lo: int, hi: int, shift: float = 0.0) -> NoteColumns:
+        """Columns of notes ``lo:hi``, with ``shift`` seconds taken off each start."""
+        durations = self.duration[lo:hi]
+        return NoteColumns(
+            start_time=array("d", [t - shift for t in self.start_time[lo:hi]]),
+            duration=durations,
+            pitch=self.pitch[lo:hi],
+            velocity=self.velocity[lo:hi],
+            hand=self.hand[lo:hi],
+            track=self.track[lo:hi],
+            max_duration=max(durations, default=0.0),
+        )
+
+
 @dataclass
 class Song:
     """Parsed representation of a MIDI/MusicXML file."""
@@ -54,6 +113,29 @@ class Song:
     time_signatures: list[TimeSignature] = field(default_factory=list)
     ticks_per_beat: int = 480
     duration: float = 0.0  # total length in seconds
+    _columns: NoteColumns | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        # A new notes list makes the column view stale
+        if name == "notes":
+            super().__setattr__("_columns", None)
+
+    def columns(self) -> NoteColumns:
+        """Column view of ``notes`` for per-frame scans, built on first use.
+
+        It is rebuilt when ``notes`` is assigned a new list or its length
+        changes. Replacing or editing notes in place, which keeps the
+        length, must be followed by invalidate_columns().
+        """
+        cols = self._columns
+        if cols is None or len(cols.start_time) != len(self.notes):
+            cols = self._columns = NoteColumns.from_notes(self.notes)
+        return cols
+
+    def invalidate_columns(self) -> None:
+        """Drop the column view after the notes were edited in place."""
+        self._columns = None
 
 
 @dataclass
@@ -64,7 +146,7 @@ class HitResult:
     timing_offset_ms: float  # negative = early, positive = late
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStats:
     song_title: str = ""
     total_notes: int = 0
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
 import pygame
 
-from keyfall.models import HitGrade, NoteEvent, Song
+from keyfall.models import HitGrade, NoteColumns, NoteEvent, Song
 from keyfall.renderer.colors import (
     HUD_TEXT,
     NOTE_GOOD,
@@ -34,6 +39,17 @@ def _get_accidental_font() -> pygame.font.Font:
     return _accidental_font
 
 
+# Rendered "#" glyph per note color; there are only a handful of colors
+_sharp_glyphs: dict[tuple[int, int, int], pygame.Surface] = {}
+
+
+def _get_sharp_glyph(color: tuple[int, int, int]) -> pygame.Surface:
+    glyph = _sharp_glyphs.get(color)
+    if glyph is None:
+        glyph = _sharp_glyphs[color] = _get_accidental_font().render("#", True, color)
+    return glyph
+
+
 def _pitch_to_staff_position(pitch: int) -> int:
     """Convert MIDI pitch to diatonic staff position relative to middle C (0).
 
@@ -54,6 +70,141 @@ def _is_accidental(pitch: int) -> bool:
     return (pitch % 12) in {1, 3, 6, 8, 10}
 
 
+# Both are pure functions of pitch; tables over the MIDI range replace the calls
+_STAFF_POSITION_TABLE = [_pitch_to_staff_position(p) for p in range(128)]
+_ACCIDENTAL_TABLE = bytes(_is_accidental(p) for p in range(128))
+
+
+@dataclass
+class _NoteGeometry:
+    """Per-note layout that doesn't depend on the scroll position, index-aligned with Song.notes.
+
+    Vertical offsets are relative to the note's staff anchor: the bottom
+    treble line for treble notes, the top bass line for bass notes.
+    """
+
+    treble: bytes  # 1 if drawn on the treble staff
+    y_offset: array  # note head y minus the anchor
+    ledger_dy: array  # ledger line y minus the anchor, 0 for none
+    stem_dir: array  # -1 up, 1 down
+    sharp: bytes
+    filled: bytes  # filled head for a quarter or shorter
+
+
+def _build_note_geometry(notes: list[NoteEvent]) -> _NoteGeometry:
+    half_space = _LINE_SPACING // 2
+    treble = bytearray()
+    y_offset = array("h")
+    ledger_dy = array("h")
+    stem_dir = array("b")
+    for note in notes:
+        staff_pos = _STAFF_POSITION_TABLE[note.pitch]
+        if note.pitch >= 60:
+            # Treble bottom line = E4 (staff_pos=2)
+            dy = -(staff_pos - 2) * half_space
+            # Only the middle-C line lies below the treble staff
+            ledger = _LINE_SPACING if staff_pos <= 1 and _LINE_SPACING >= dy - 1 else 0
+        else:
+            # Bass top line = G3 (staff_pos=-3 from C4)
+            dy = -(staff_pos + 3) * half_space
+            # Only the middle-C line lies above the bass staff
+            ledger = -_LINE_SPACING if staff_pos >= -2 and -_LINE_SPACING <= dy + 1 else 0
+        treble.append(note.pitch >= 60)
+        y_offset.append(dy)
+        ledger_dy.append(ledger)
+        stem_dir.append(-1 if staff_pos > 0 else 1)
+    return _NoteGeometry(
+        treble=bytes(treble),
+        y_offset=y_offset,
+        ledger_dy=ledger_dy,
+        stem_dir=stem_dir,
+        sharp=bytes([_ACCIDENTAL_TABLE[n.pitch] for n in notes]),
+        filled=bytes(n.duration <= 1.0 for n in notes),
+    )
+
+
+# (song, song.columns() it was built for, geometry) of the last song drawn;
+# the columns are replaced whenever the song's notes are, like analysis's cache
+_geometry_cache: tuple[weakref.ref, NoteColumns, _NoteGeometry] | None = None
+
+
+def _note_geometry(song: Song) -> _NoteGeometry:
+    global _geometry_cache
+    cols = song.columns()
+    if _geometry_cache is not None:
+        ref, cached_cols, geo = _geometry_cache
+        if ref() is song and cached_cols is cols:
+            return geo
+    geo = _build_note_geometry(song.notes)
+    _geometry_cache = (weakref.ref(song), cols, geo)
+    return geo
+
+
+# Pre-drawn staves and cursor for the last notation size, ((width, height), layer)
+_staff_layer: tuple[tuple[int, int], pygame.Surface] | None = None
+
+
+def _get_staff_layer(width: int, height: int) -> pygame.Surface:
+    """Return a transparent layer with both staves and the cursor drawn at this size."""
+    global _staff_layer
+    if _staff_layer is not None and _staff_layer[0] == (width, height):
+        return _staff_layer[1]
+
+    layer = pygame.Surface((width, height), pygame.SRCALPHA)
+    center_y = height // 2
+    treble_bottom = center_y - _STAFF_GAP // 2
+    bass_top = center_y + _STAFF_GAP // 2
+
+    # Treble staff (5 lines, bottom to top), then bass staff (top to bottom)
+    for i in range(5):
+        ly = treble_bottom - i * _LINE_SPACING
+        pygame.draw.line(layer, _STAFF_LINE_COLOR, (0, ly), (width, ly))
+    for i in range(5):
+        ly = bass_top + i * _LINE_SPACING
+        pygame.draw.line(layer, _STAFF_LINE_COLOR, (0, ly), (width, ly))
+
+    # Playback cursor
+    cursor_x = int(width * _CURSOR_X_RATIO)
+    pygame.draw.line(layer, _CURSOR_COLOR, (cursor_x, 10), (cursor_x, height - 10), 2)
+
+    _staff_layer = ((width, height), layer)
+    return layer
+
+
+def _layout_visible(
+    starts: array,
+    durations: array,
+    geo: _NoteGeometry,
+    lo: int,
+    hi: int,
+    left_time: float,
+    playback_position: float,
+    cursor_x: int,
+    x_min: int,
+    x_max: int,
+    treble_bottom: int,
+    bass_top: int,
+) -> list[tuple[int, int, int, int]]:
+    """Position the notes in [lo, hi) that are on screen.
+
+    Returns (index, note_x, anchor_y, note_y) per visible note, so the draw
+    loop does no culling or layout arithmetic.
+    """
+    treble = geo.treble
+    y_offset = geo.y_offset
+    visible: list[tuple[int, int, int, int]] = []
+    for idx in range(lo, hi):
+        start = starts[idx]
+        if start + durations[idx] < left_time:
+            continue
+        note_x = cursor_x + int((start - playback_position) * _PIXELS_PER_SECOND)
+        if note_x < x_min or note_x > x_max:
+            continue
+        anchor_y = treble_bottom if treble[idx] else bass_top
+        visible.append((idx, note_x, anchor_y, anchor_y + y_offset[idx]))
+    return visible
+
+
 def render_notation(
     surface: pygame.Surface,
     song: Song,
@@ -84,61 +235,33 @@ def render_notation(
     treble_bottom = center_y - _STAFF_GAP // 2  # bottom line of treble staff
     bass_top = center_y + _STAFF_GAP // 2  # top line of bass staff
 
-    # Draw treble staff (5 lines, bottom to top)
-    for i in range(5):
-        ly = treble_bottom - i * _LINE_SPACING
-        pygame.draw.line(surface, _STAFF_LINE_COLOR, (x, ly), (x + width, ly))
-
-    # Draw bass staff (5 lines, top to bottom)
-    for i in range(5):
-        ly = bass_top + i * _LINE_SPACING
-        pygame.draw.line(surface, _STAFF_LINE_COLOR, (x, ly), (x + width, ly))
-
-    # Draw playback cursor
+    # Staves and cursor are static for a given size; blit the cached layer
+    surface.blit(_get_staff_layer(width, height), (x, y))
     cursor_x = x + int(width * _CURSOR_X_RATIO)
-    pygame.draw.line(surface, _CURSOR_COLOR, (cursor_x, y + 10), (cursor_x, y + height - 10), 2)
 
     # Visible time window
     left_time = playback_position - (_CURSOR_X_RATIO * width / _PIXELS_PER_SECOND)
     right_time = playback_position + ((1.0 - _CURSOR_X_RATIO) * width / _PIXELS_PER_SECOND)
 
-    # Render notes
-    for idx, note in enumerate(song.notes):
-        if note.start_time > right_time:
-            break
-        if note.start_time + note.duration < left_time:
-            continue
-
-        note_x = cursor_x + int((note.start_time - playback_position) * _PIXELS_PER_SECOND)
-        if note_x < x - 20 or note_x > x + width + 20:
-            continue
-
-        staff_pos = _pitch_to_staff_position(note.pitch)
-
-        # Y position: treble for pitch >= 60, bass otherwise
-        half_space = _LINE_SPACING // 2
-        if note.pitch >= 60:
-            # Treble bottom line = E4 (staff_pos=2)
-            note_y = treble_bottom - (staff_pos - 2) * half_space
-        else:
-            # Bass top line = G3 (staff_pos=-3 from C4)
-            note_y = bass_top - (staff_pos - (-3)) * half_space
-
-        # Ledger lines
-        if note.pitch >= 60 and staff_pos <= 1:
-            ledger_y = treble_bottom + _LINE_SPACING
-            while ledger_y >= note_y - 1:
-                if ledger_y > treble_bottom:
-                    pygame.draw.line(surface, _LEDGER_COLOR,
-                                     (note_x - 8, ledger_y), (note_x + 8, ledger_y))
-                ledger_y -= _LINE_SPACING
-        elif note.pitch < 60 and staff_pos >= -2:
-            ledger_y = bass_top - _LINE_SPACING
-            while ledger_y <= note_y + 1:
-                if ledger_y < bass_top:
-                    pygame.draw.line(surface, _LEDGER_COLOR,
-                                     (note_x - 8, ledger_y), (note_x + 8, ledger_y))
-                ledger_y += _LINE_SPACING
+    # Render notes; notes start in order, so only [lo, hi) can reach the window
+    cols = song.columns()
+    starts = cols.start_time
+    geo = _note_geometry(song)
+    lo = bisect_left(starts, left_time - cols.max_duration)
+    hi = bisect_right(starts, right_time)
+    visible = _layout_visible(
+        starts, cols.duration, geo, lo, hi, left_time, playback_position,
+        cursor_x, x - 20, x + width + 20, treble_bottom, bass_top,
+    )
+
+    # Draw pass: only pygame calls and color choice per note
+    radius = 5
+    for idx, note_x, anchor_y, note_y in visible:
+        ledger_dy = geo.ledger_dy[idx]
+        if ledger_dy:
+            ledger_y = anchor_y + ledger_dy
+            pygame.draw.line(surface, _LEDGER_COLOR,
+                             (note_x - 8, ledger_y), (note_x + 8, ledger_y))
 
         # Note color
         if idx in hit_results:
@@ -151,26 +274,21 @@ def render_notation(
                 color = NOTE_MISS
             else:
                 color = HUD_TEXT
-        elif note.start_time < playback_position:
+        elif starts[idx] < playback_position:
             color = (100, 100, 120)
         else:
             color = HUD_TEXT
 
         # Note head (filled for quarter or shorter, open for half+)
-        radius = 5
-        filled = note.duration <= 1.0
-        pygame.draw.circle(surface, color, (note_x, int(note_y)), radius, 0 if filled else 1)
+        pygame.draw.circle(surface, color, (note_x, note_y), radius, 0 if geo.filled[idx] else 1)
 
         # Stem
-        stem_dir = -1 if staff_pos > 0 else 1
+        stem_dir = geo.stem_dir[idx]
         stem_x = note_x + (radius if stem_dir == -1 else -radius)
-        stem_end_y = int(note_y) + stem_dir * 30
-        pygame.draw.line(surface, color, (stem_x, int(note_y)), (stem_x, stem_end_y))
+        pygame.draw.line(surface, color, (stem_x, note_y), (stem_x, note_y + stem_dir * 30))
 
         # Accidental
-        if _is_accidental(note.pitch):
-            font = _get_accidental_font()
-            sharp_surf = font.render("#", True, color)
-            surface.blit(sharp_surf, (note_x - radius - 10, int(note_y) - 6))
+        if geo.sharp[idx]:
+            surface.blit(_get_sharp_glyph(color), (note_x - radius - 10, note_y - 6))
 
     surface.set_clip(None)
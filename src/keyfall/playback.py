@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections.abc import Set
 from dataclasses import dataclass
+from itertools import compress, repeat
+from operator import eq, ne, not_
 
-from keyfall.models import Hand, NoteEvent, Song
+from keyfall.models import HAND_CODES, Hand, NoteColumns, NoteEvent, Song
 
 
 @dataclass
@@ -33,7 +37,13 @@ class Metronome:
         self.beats_per_bar = beats_per_bar
         self.enabled = False
         self._beat_counter = 0
-        self._time_since_last_beat = 0.0
+        # Clicks fall at _anchor + k * beat duration on the update() clock;
+        # the anchor moves to the last click whenever the tempo changes
+        self._elapsed = 0.0
+        self._anchor = 0.0
+        self._beats_since_anchor = 0
+        self._tempo: tuple[float, float] | None = None  # (bpm, tempo_scale)
+        self._beat_duration = 0.0
 
     def update(self, dt: float, tempo_scale: float = 1.0) -> list[tuple[int, int]]:
         """Advance the metronome. Returns list of (midi_note, velocity) clicks to play.
@@ -44,12 +54,18 @@ class Metronome:
         if not self.enabled:
             return []
 
-        beat_duration = 60.0 / (self.bpm * tempo_scale)
-        self._time_since_last_beat += dt
+        if self._tempo != (self.bpm, tempo_scale):
+            if self._tempo is not None:
+                self._anchor += self._beats_since_anchor * self._beat_duration
+                self._beats_since_anchor = 0
+            self._tempo = (self.bpm, tempo_scale)
+            self._beat_duration = 60.0 / (self.bpm * tempo_scale)
+
+        self._elapsed += dt
         clicks: list[tuple[int, int]] = []
 
-        while self._time_since_last_beat >= beat_duration:
-            self._time_since_last_beat -= beat_duration
+        while self._anchor + (self._beats_since_anchor + 1) * self._beat_duration <= self._elapsed:
+            self._beats_since_anchor += 1
             is_downbeat = (self._beat_counter % self.beats_per_bar) == 0
             note = 76 if is_downbeat else 37
             velocity = 100 if is_downbeat else 70
@@ -60,7 +76,9 @@ class Metronome:
 
     def reset(self) -> None:
         self._beat_counter = 0
-        self._time_since_last_beat = 0.0
+        self._elapsed = 0.0
+        self._anchor = 0.0
+        self._beats_since_anchor = 0
 
 
 class PlaybackEngine:
@@ -74,13 +92,30 @@ class PlaybackEngine:
         self.tempo_scale: float = 1.0
         self.paused: bool = False
         self.active_hand: Hand = Hand.BOTH
+        self.lookahead: float = 0.02  # song seconds handed out ahead of position
+        self._schedule_index = 0  # first note schedule_ahead() hasn't returned
+        # (note_index, active_hand, upcoming group, its required pitches) in wait mode
+        self._wait_cache: tuple[int, Hand, list[NoteEvent], frozenset[int]] | None = None
+        # Song notes made active by the last update(), as an index range
+        self._activated = (0, 0)
+        # Active hand -> (song.columns() it was built from, per note of the
+        # song whether auto-play sounds it)
+        self._autoplay_masks: dict[Hand, tuple[NoteColumns, list[bool]]] = {}
+
+    def seek(self, position: float) -> None:
+        """Jump to ``position``; notes from there on become active (and scheduled) again."""
+        self.position = position
+        self.note_index = bisect_left(self.song.columns().start_time, position)
+        self._schedule_index = self.note_index
 
     def set_tempo_scale(self, scale: float) -> None:
         """Set tempo scale, clamped to [0.25, 2.0]."""
         self.tempo_scale = max(0.25, min(2.0, scale))
 
-    def update(self, dt: float, pressed_pitches: set[int]) -> list[NoteEvent]:
+    def update(self, dt: float, pressed_pitches: Set[int]) -> list[NoteEvent]:
         """Advance playback by dt seconds. Returns notes that became active this frame."""
+        start = self.note_index
+        self._activated = (start, start)
         if self.paused:
             return []
 
@@ -92,18 +127,72 @@ class PlaybackEngine:
             self.position += dt * self.tempo_scale
             newly_active = self._collect_active_notes()
 
+        self._activated = (start, self.note_index)
         return newly_active
 
-    def _advance_wait_mode(self, pressed_pitches: set[int]) -> list[NoteEvent]:
+    def _autoplay_mask(self) -> list[bool]:
+        """Per note of the song, whether it belongs to a hand the player isn't playing."""
+        hand = self.active_hand
+        cols = self.song.columns()
+        cached = self._autoplay_masks.get(hand)
+        if cached is not None and cached[0] is cols:
+            return cached[1]
+        if hand is Hand.BOTH:
+            mask = [False] * len(cols.hand)
+        else:
+            mask = list(map(ne, cols.hand, repeat(HAND_CODES[hand])))
+        self._autoplay_masks[hand] = (cols, mask)
+        return mask
+
+    def autoplay_activated(self) -> list[NoteEvent]:
+        """The notes made active by the last update() that auto-play should sound."""
+        start, end = self._activated
+        if start == end:
+            return []
+        return list(compress(self.song.notes[start:end], self._autoplay_mask()[start:end]))
+
+    def schedule_ahead(self, autoplay_only: bool = False) -> list[tuple[float, NoteEvent]]:
+        """Return notes starting up to ``lookahead`` past the position, as (delay, note).
+
+        Call once per frame after update(). Each note is returned once, with
+        its delay in real seconds from now at the current tempo, so audio can
+        be timed precisely instead of on the next frame. Nothing is returned
+        while paused or in wait mode, where notes only sound once played.
+        With ``autoplay_only``, only notes of a hand the player isn't playing
+        are returned, picked with a per-hand mask built once per song.
+        """
+        if self.paused:
+            return []
+        if self.wait_mode:
+            self._schedule_index = max(self._schedule_index, self.note_index)
+            return []
+
+        start = self._schedule_index
+        end = bisect_right(self.song.columns().start_time, self.position + self.lookahead, start)
+        self._schedule_index = end
+        position = self.position
+        scale = self.tempo_scale
+        notes = self.song.notes[start:end]
+        if autoplay_only and notes:
+            notes = compress(notes, self._autoplay_mask()[start:end])
+        return [(max(0.0, (note.start_time - position) / scale), note) for note in notes]
+
+    def _advance_wait_mode(self, pressed_pitches: Set[int]) -> list[NoteEvent]:
         """In wait mode, only advance when the player plays the correct note(s)."""
         if self.note_index >= len(self.song.notes):
             return []
 
-        upcoming = self._get_simultaneous_notes()
-        required = {
-            n.pitch for n in upcoming
-            if self.active_hand == Hand.BOTH or n.hand == self.active_hand
-        }
+        # The same group is waited on for many frames; rebuild it only when it changes
+        cache = self._wait_cache
+        if cache is not None and cache[0] == self.note_index and cache[1] is self.active_hand:
+            upcoming, required = cache[2], cache[3]
+        else:
+            upcoming = self._get_simultaneous_notes()
+            required = frozenset(
+                n.pitch for n in upcoming
+                if self.active_hand == Hand.BOTH or n.hand == self.active_hand
+            )
+            self._wait_cache = (self.note_index, self.active_hand, upcoming, required)
 
         if required and required.issubset(pressed_pitches):
             self.note_index += len(upcoming)
@@ -113,15 +202,10 @@ class PlaybackEngine:
         return []
 
     def _collect_active_notes(self) -> list[NoteEvent]:
-        active: list[NoteEvent] = []
-        while self.note_index < len(self.song.notes):
-            note = self.song.notes[self.note_index]
-            if note.start_time <= self.position:
-                active.append(note)
-                self.note_index += 1
-            else:
-                break
-        return active
+        start = self.note_index
+        end = bisect_right(self.song.columns().start_time, self.position, start)
+        self.note_index = end
+        return self.song.notes[start:end]
 
     def _get_simultaneous_notes(self, tolerance: float = 0.05) -> list[NoteEvent]:
         """Get all notes starting at approximately the same time as the current note."""
@@ -151,11 +235,16 @@ def split_hands(song: Song) -> tuple[Song, Song]:
     right = Song(title=song.title, tempo_changes=list(song.tempo_changes),
                  time_signatures=list(song.time_signatures), ticks_per_beat=song.ticks_per_beat)
 
-    for note in song.notes:
-        if note.hand == Hand.LEFT:
-            left.notes.append(note)
-        else:
-            right.notes.append(note)
+    # Select each part from the hand column rather than branching per note
+    cols = song.columns()
+    left_code = HAND_CODES[Hand.LEFT]
+    is_left = list(map(eq, cols.hand, repeat(left_code)))
+    is_right = list(map(not_, is_left))
+    left.notes = list(compress(song.notes, is_left))
+    right.notes = list(compress(song.notes, is_right))
+    # Each part's columns come straight from the parent's, not from its notes
+    left._columns = cols.compress(is_left)
+    right._columns = cols.compress(is_right)
 
     for s in (left, right):
         if s.notes:
@@ -193,18 +282,24 @@ def select_section(
         ticks_per_beat=song.ticks_per_beat,
     )
 
-    for note in song.notes:
-        if start_time <= note.start_time < end_time:
-            section.notes.append(
-                NoteEvent(
-                    pitch=note.pitch,
-                    start_time=note.start_time - start_time,
-                    duration=note.duration,
-                    velocity=note.velocity,
-                    hand=note.hand,
-                    track=note.track,
-                )
+    # Notes are in start-time order, so the section is one contiguous slice
+    cols = song.columns()
+    starts = cols.start_time
+    lo = bisect_left(starts, start_time)
+    hi = bisect_left(starts, end_time, lo)
+    for note in song.notes[lo:hi]:
+        section.notes.append(
+            NoteEvent(
+                pitch=note.pitch,
+                start_time=note.start_time - start_time,
+                duration=note.duration,
+                velocity=note.velocity,
+                hand=note.hand,
+                track=note.track,
             )
+        )
+
+    section._columns = cols.window(lo, hi, start_time)
 
     if section.notes:
         last = section.notes[-1]
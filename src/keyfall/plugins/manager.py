@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
-from importlib.metadata import entry_points
+import os
+import sys
+from importlib.metadata import EntryPoint, entry_points
 from typing import Any, Literal, Protocol, runtime_checkable
 
 import pygame
@@ -60,60 +62,127 @@ class InputPlugin(Protocol):
     def close(self) -> None: ...
 
 
+# Methods that classify a generic plugin class, checked in order. Probing the
+# class is much cheaper than instantiating it for a runtime Protocol check.
+_GENERIC_KINDS: list[tuple[str, tuple[str, ...]]] = [
+    ("scoring", ("on_hit", "on_frame", "get_score")),
+    ("visualization", ("render",)),
+    ("input", ("poll", "close")),
+]
+
+
+_PLUGIN_GROUPS = ("keyfall.plugins", "keyfall.views", "keyfall.panels")
+
+# (sys.path directories with their mtimes, entry points by group) of the last scan
+_entry_point_cache: tuple[tuple[tuple[str, float], ...], dict[str, list[EntryPoint]]] | None = None
+
+
+def _path_signature() -> tuple[tuple[str, float], ...]:
+    """The sys.path directories and their mtimes; installing a distribution changes one."""
+    signature = []
+    for path in sys.path:
+        try:
+            signature.append((path, os.stat(path or ".").st_mtime))
+        except OSError:
+            continue
+    return tuple(signature)
+
+
+def _plugin_entry_points() -> dict[str, list[EntryPoint]]:
+    """Return the keyfall entry points by group, rescanning metadata only when sys.path changed."""
+    global _entry_point_cache
+    signature = _path_signature()
+    if _entry_point_cache is not None and _entry_point_cache[0] == signature:
+        return _entry_point_cache[1]
+    # Read installed metadata once and select each group from it, rather
+    # than rescanning every distribution per group
+    all_eps = entry_points()
+    groups = {group: list(all_eps.select(group=group)) for group in _PLUGIN_GROUPS}
+    _entry_point_cache = (signature, groups)
+    return groups
+
+
 class PluginManager:
     """Discovers and manages plugins from entry points."""
 
     def __init__(self) -> None:
-        self._scoring: list[ScoringPlugin] = []
-        self._visualizations: list[VisualizationPlugin] = []
-        self._inputs: list[InputPlugin] = []
-        self._view_classes: list[type] = []
-        self._panel_classes: list[type] = []
+        # Generic plugin classes by kind; instantiated on first retrieval
+        self._generic_classes: dict[str, list[type]] = {kind: [] for kind, _ in _GENERIC_KINDS}
+        # Held as tuples so the getters can hand them out without copying
+        self._generic_instances: dict[str, tuple[Any, ...]] = {}
+        self._view_classes: tuple[type, ...] = ()
+        self._panel_classes: tuple[type, ...] = ()
+        # Discovered entry points by group, not yet imported
+        self._unloaded: dict[str, list[EntryPoint]] = {}
 
     def discover(self) -> None:
-        """Scan entry points for keyfall plugins."""
-        for group, handler in [
-            ("keyfall.plugins", self._register_generic),
-            ("keyfall.views", self._register_view),
-            ("keyfall.panels", self._register_panel),
-        ]:
+        """Scan entry points for keyfall plugins.
+
+        Only the entry points are listed here; a group's plugin modules are
+        imported the first time plugins of that group are asked for, so
+        unused plugins and their dependencies stay out of startup.
+        """
+        eps = _plugin_entry_points()
+        for group in _PLUGIN_GROUPS:
+            self._unloaded.setdefault(group, []).extend(eps[group])
+
+    def _load_group(self, group: str) -> None:
+        """Import and register the discovered entry points of ``group``."""
+        eps = self._unloaded.pop(group, None)
+        if not eps:
+            return
+        handler = {
+            "keyfall.plugins": self._register_generic,
+            "keyfall.views": self._register_view,
+            "keyfall.panels": self._register_panel,
+        }[group]
+        for ep in eps:
             try:
-                eps = entry_points(group=group)
-            except TypeError:
-                eps = entry_points().get(group, [])
-            for ep in eps:
-                try:
-                    cls = ep.load()
-                    handler(cls)
-                except Exception as exc:
-                    logger.warning("Failed to load plugin %s: %s", ep.name, exc)
+                cls = ep.load()
+                handler(cls)
+            except Exception as exc:
+                logger.warning("Failed to load plugin %s: %s", ep.name, exc)
 
     def _register_generic(self, cls: type) -> None:
-        instance = cls()
-        if isinstance(instance, ScoringPlugin):
-            self._scoring.append(instance)
-        elif isinstance(instance, VisualizationPlugin):
-            self._visualizations.append(instance)
-        elif isinstance(instance, InputPlugin):
-            self._inputs.append(instance)
+        for kind, methods in _GENERIC_KINDS:
+            if all(callable(getattr(cls, m, None)) for m in methods):
+                self._generic_classes[kind].append(cls)
+                self._generic_instances.pop(kind, None)
+                return
+
+    def _instances(self, kind: str) -> tuple[Any, ...]:
+        """Instantiate the plugins of one kind the first time they're asked for."""
+        self._load_group("keyfall.plugins")
+        instances = self._generic_instances.get(kind)
+        if instances is None:
+            instances = []
+            for cls in self._generic_classes[kind]:
+                try:
+                    instances.append(cls())
+                except Exception as exc:
+                    logger.warning("Failed to load plugin %s: %s", cls.__name__, exc)
+            instances = self._generic_instances[kind] = tuple(instances)
+        return instances
 
     def _register_view(self, cls: type) -> None:
-        self._view_classes.append(cls)
+        self._view_classes = (*self._view_classes, cls)
 
     def _register_panel(self, cls: type) -> None:
-        self._panel_classes.append(cls)
+        self._panel_classes = (*self._panel_classes, cls)
 
-    def get_scoring_plugins(self) -> list[ScoringPlugin]:
-        return list(self._scoring)
+    def get_scoring_plugins(self) -> tuple[ScoringPlugin, ...]:
+        return self._instances("scoring")
 
-    def get_visualization_plugins(self) -> list[VisualizationPlugin]:
-        return list(self._visualizations)
+    def get_visualization_plugins(self) -> tuple[VisualizationPlugin, ...]:
+        return self._instances("visualization")
 
-    def get_input_plugins(self) -> list[InputPlugin]:
-        return list(self._inputs)
+    def get_input_plugins(self) -> tuple[InputPlugin, ...]:
+        return self._instances("input")
 
-    def get_view_plugins(self) -> list[type]:
-        return list(self._view_classes)
+    def get_view_plugins(self) -> tuple[type, ...]:
+        self._load_group("keyfall.views")
+        return self._view_classes
 
-    def get_panel_plugins(self) -> list[type]:
-        return list(self._panel_classes)
+    def get_panel_plugins(self) -> tuple[type, ...]:
+        self._load_group("keyfall.panels")
+        return self._panel_classes
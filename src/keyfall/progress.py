@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterable
 from pathlib import Path
 
 from keyfall.models import SessionStats
@@ -14,9 +15,16 @@ class ProgressTracker:
     def __init__(self, db_path: Path = DEFAULT_DB_PATH) -> None:
         db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(db_path))
+        self.conn.row_factory = sqlite3.Row
         self._init_db()
 
     def _init_db(self) -> None:
+        # Write-ahead log: a save appends to the WAL instead of rewriting a
+        # rollback journal, and NORMAL sync skips the per-commit fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -31,13 +39,23 @@ class ProgressTracker:
                 played_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # History queries filter by song and order by time
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_sessions_song_played"
+            " ON sessions(song_title, played_at DESC)"
+        )
         self.conn.commit()
 
     def save_session(self, stats: SessionStats) -> None:
-        self.conn.execute(
-            """INSERT INTO sessions
-               (song_title, total_notes, perfect, good, ok, missed, max_streak, accuracy_pct)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+        self.save_sessions([stats])
+
+    def save_sessions(self, stats_list: Iterable[SessionStats]) -> None:
+        """Insert several sessions in one transaction.
+
+        Callers recording many sessions can buffer them and flush here,
+        paying for one commit instead of one per session.
+        """
+        rows = [
             (
                 stats.song_title,
                 stats.total_notes,
@@ -47,9 +65,18 @@ class ProgressTracker:
                 stats.missed,
                 stats.max_streak,
                 stats.accuracy_pct,
-            ),
-        )
-        self.conn.commit()
+            )
+            for stats in stats_list
+        ]
+        if not rows:
+            return
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO sessions
+                   (song_title, total_notes, perfect, good, ok, missed, max_streak, accuracy_pct)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
 
     def get_history(self, song_title: str | None = None, limit: int = 50) -> list[dict]:
         if song_title:
@@ -61,8 +88,7 @@ class ProgressTracker:
             cur = self.conn.execute(
                 "SELECT * FROM sessions ORDER BY played_at DESC LIMIT ?", (limit,)
             )
-        cols = [d[0] for d in cur.description]
-        return [dict(zip(cols, row)) for row in cur.fetchall()]
+        return [dict(row) for row in cur.fetchall()]
 
     def get_best(self, song_title: str) -> dict | None:
         """Return the session with the highest accuracy for a given song, or None."""
@@ -73,8 +99,7 @@ class ProgressTracker:
         row = cur.fetchone()
         if row is None:
             return None
-        cols = [d[0] for d in cur.description]
-        return dict(zip(cols, row))
+        return dict(row)
 
     def get_streak_history(self, song_title: str) -> list[int]:
         """Return a list of max_streak values over time for a song (oldest first)."""
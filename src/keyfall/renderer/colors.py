@@ -1,5 +1,11 @@
 """Color palette (colorblind-safe defaults)."""
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+RGB = tuple[int, int, int]
+
 # RGB tuples
 BG = (18, 18, 24)
 WHITE_KEY = (240, 240, 240)
@@ -10,3 +16,37 @@ NOTE_PERFECT = (80, 220, 100)
 NOTE_GOOD = (180, 220, 80)
 NOTE_MISS = (220, 60, 60)
 HUD_TEXT = (220, 220, 220)
+
+
+@dataclass(frozen=True)
+class ColorPack:
+    """The set of colors an accessibility palette replaces."""
+
+    note_rh: RGB
+    note_lh: RGB
+    bg: RGB
+    hud_text: RGB
+    white_key: RGB
+    black_key: RGB
+
+
+# Startup colors, for palettes that only change the notes and background
+DEFAULT_PACK = ColorPack(
+    note_rh=NOTE_RIGHT_HAND,
+    note_lh=NOTE_LEFT_HAND,
+    bg=BG,
+    hud_text=HUD_TEXT,
+    white_key=WHITE_KEY,
+    black_key=BLACK_KEY,
+)
+
+
+def apply(pack: ColorPack) -> None:
+    """Replace every palette-dependent color with the values in ``pack``."""
+    global NOTE_RIGHT_HAND, NOTE_LEFT_HAND, BG, HUD_TEXT, WHITE_KEY, BLACK_KEY
+    NOTE_RIGHT_HAND = pack.note_rh
+    NOTE_LEFT_HAND = pack.note_lh
+    BG = pack.bg
+    HUD_TEXT = pack.hud_text
+    WHITE_KEY = pack.white_key
+    BLACK_KEY = pack.black_key
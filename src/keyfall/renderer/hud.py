@@ -7,18 +7,39 @@ import pygame
 from keyfall.models import SessionStats
 from keyfall.renderer.colors import HUD_TEXT
 
+_hud_font: pygame.font.Font | None = None
+
+
+def _get_hud_font() -> pygame.font.Font:
+    global _hud_font
+    if _hud_font is None:
+        _hud_font = pygame.font.SysFont("monospace", 20)
+    return _hud_font
 
-def render_hud(surface: pygame.Surface, stats: SessionStats) -> None:
-    font = pygame.font.SysFont("monospace", 20)
 
-    lines = [
-        f"Score: {stats.perfect * 3 + stats.good * 2 + stats.ok}",
-        f"Streak: {stats.max_streak}",
-        f"Accuracy: {stats.accuracy_pct:.0f}%",
-    ]
+# (score, max_streak, accuracy_pct) of the last frame and its rendered lines;
+# the stats only change on a hit or miss, so most frames re-blit these
+_last_values: tuple[int, int, float] | None = None
+_last_lines: list[pygame.Surface] = []
+
+
+def render_hud(surface: pygame.Surface, stats: SessionStats) -> None:
+    global _last_values, _last_lines
+    values = (stats.perfect * 3 + stats.good * 2 + stats.ok, stats.max_streak, stats.accuracy_pct)
+    if values != _last_values:
+        score, max_streak, accuracy_pct = values
+        font = _get_hud_font()
+        _last_lines = [
+            font.render(line, True, HUD_TEXT)
+            for line in (
+                f"Score: {score}",
+                f"Streak: {max_streak}",
+                f"Accuracy: {accuracy_pct:.0f}%",
+            )
+        ]
+        _last_values = values
 
     y = 10
-    for line in lines:
-        text = font.render(line, True, HUD_TEXT)
+    for text in _last_lines:
         surface.blit(text, (10, y))
         y += 28
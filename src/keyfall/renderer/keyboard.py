@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Set
+
 import pygame
 
 from keyfall.config import MIDI_NOTE_MAX, MIDI_NOTE_MIN, WINDOW_HEIGHT, WINDOW_WIDTH
-from keyfall.renderer.colors import BLACK_KEY, NOTE_PERFECT, WHITE_KEY
+from keyfall.renderer.colors import BG, BLACK_KEY, NOTE_PERFECT, WHITE_KEY
 
 KEYBOARD_HEIGHT = 120
 KEYBOARD_Y = WINDOW_HEIGHT - KEYBOARD_HEIGHT
@@ -18,51 +20,107 @@ def is_black_key(pitch: int) -> bool:
     return (pitch % 12) in _BLACK_OFFSETS
 
 
-def _white_key_count() -> int:
-    return sum(1 for p in range(MIDI_NOTE_MIN, MIDI_NOTE_MAX + 1) if not is_black_key(p))
+_WHITE_KEY_COUNT = sum(
+    1 for p in range(MIDI_NOTE_MIN, MIDI_NOTE_MAX + 1) if (p % 12) not in _BLACK_OFFSETS
+)
+_WHITE_W = WINDOW_WIDTH / _WHITE_KEY_COUNT
+
+
+def _build_key_tables() -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """Return the x center and width of every MIDI pitch 0-127 on the keyboard."""
+    centers = []
+    widths = []
+    white_idx = 0  # white keys in [MIDI_NOTE_MIN, pitch)
+    for pitch in range(128):
+        if is_black_key(pitch):
+            # Match render loop: bx = wx - bw/2 - white_w*0.15, center = bx + bw/2
+            bw = _WHITE_W * 0.6
+            bx = white_idx * _WHITE_W - bw / 2 - _WHITE_W * 0.15
+            centers.append(bx + bw / 2)
+            widths.append(bw)
+        else:
+            centers.append(white_idx * _WHITE_W + _WHITE_W / 2)
+            widths.append(_WHITE_W)
+            if pitch >= MIDI_NOTE_MIN:
+                white_idx += 1
+    return tuple(centers), tuple(widths)
 
 
-def key_x_position(pitch: int) -> float:
-    """Return the x center of a given MIDI pitch on the rendered keyboard."""
-    white_w = WINDOW_WIDTH / _white_key_count()
-    white_idx = 0
-    for p in range(MIDI_NOTE_MIN, pitch):
+_X_CENTER, _KEY_W = _build_key_tables()
+
+
+def _build_key_rects() -> tuple[list[tuple[int, tuple[int, int, int, int]]], ...]:
+    """Return the (pitch, rect) of each white key and each black key, in drawing order."""
+    white, black = [], []
+    wx = 0.0
+    for p in range(MIDI_NOTE_MIN, MIDI_NOTE_MAX + 1):
         if not is_black_key(p):
-            white_idx += 1
+            white.append((p, (int(wx), KEYBOARD_Y, int(_WHITE_W) - 1, KEYBOARD_HEIGHT)))
+            wx += _WHITE_W
+        else:
+            bw = _WHITE_W * 0.6
+            bx = wx - bw / 2 - _WHITE_W * 0.15
+            black.append((p, (int(bx), KEYBOARD_Y, int(bw), int(KEYBOARD_HEIGHT * 0.6))))
+    return white, black
 
-    if is_black_key(pitch):
-        # Match render loop: bx = wx - bw/2 - white_w*0.15, center = bx + bw/2
-        bw = white_w * 0.6
-        bx = white_idx * white_w - bw / 2 - white_w * 0.15
-        return bx + bw / 2
-    return white_idx * white_w + white_w / 2
 
+_WHITE_KEY_RECTS, _BLACK_KEY_RECTS = _build_key_rects()
 
-def key_width(pitch: int) -> float:
-    white_w = WINDOW_WIDTH / _white_key_count()
-    return white_w * 0.6 if is_black_key(pitch) else white_w
+# The same rects relative to the keyboard strip, by pitch
+_STRIP_RECTS: dict[int, tuple[int, int, int, int]] = {
+    p: (x, y - KEYBOARD_Y, w, h) for p, (x, y, w, h) in _WHITE_KEY_RECTS + _BLACK_KEY_RECTS
+}
+# White key -> the black keys drawn over its edges
+_BLACK_NEIGHBORS: dict[int, tuple[int, ...]] = {
+    p: tuple(n for n in (p - 1, p + 1) if n in _STRIP_RECTS and is_black_key(n))
+    for p, _ in _WHITE_KEY_RECTS
+}
 
+# The keyboard strip as last drawn, and the pressed keys it shows
+_strip: pygame.Surface | None = None
+_strip_pressed: frozenset[int] = frozenset()
 
-def render_keyboard(surface: pygame.Surface, pressed: set[int]) -> None:
-    """Draw an 88-key piano keyboard along the bottom of the screen."""
-    white_w = WINDOW_WIDTH / _white_key_count()
-    # White keys first
-    wx = 0.0
-    for p in range(MIDI_NOTE_MIN, MIDI_NOTE_MAX + 1):
-        if not is_black_key(p):
-            color = NOTE_PERFECT if p in pressed else WHITE_KEY
-            rect = pygame.Rect(int(wx), KEYBOARD_Y, int(white_w) - 1, KEYBOARD_HEIGHT)
-            pygame.draw.rect(surface, color, rect)
-            wx += white_w
 
-    # Black keys on top
-    wx = 0.0
-    for p in range(MIDI_NOTE_MIN, MIDI_NOTE_MAX + 1):
-        if not is_black_key(p):
-            wx += white_w
-        else:
-            bw = white_w * 0.6
-            bx = wx - bw / 2 - white_w * 0.15
-            color = NOTE_PERFECT if p in pressed else BLACK_KEY
-            rect = pygame.Rect(int(bx), KEYBOARD_Y, int(bw), int(KEYBOARD_HEIGHT * 0.6))
-            pygame.draw.rect(surface, color, rect)
+def key_x_position(pitch: int) -> float:
+    """Return the x center of a given MIDI pitch on the rendered keyboard."""
+    return _X_CENTER[pitch]
+
+
+def key_width(pitch: int) -> float:
+    return _KEY_W[pitch]
+
+
+def render_keyboard(surface: pygame.Surface, pressed: Set[int]) -> None:
+    """Draw an 88-key piano keyboard along the bottom of the screen.
+
+    The keyboard is kept on its own strip surface; only keys whose pressed
+    state changed since the last call are repainted there before the strip
+    is blitted.
+    """
+    global _strip, _strip_pressed
+    draw_rect = pygame.draw.rect
+    strip = _strip
+    if strip is None:
+        strip = _strip = pygame.Surface((WINDOW_WIDTH, KEYBOARD_HEIGHT)).convert()
+        strip.fill(BG)
+        changed = _STRIP_RECTS.keys()
+    else:
+        changed = _strip_pressed.symmetric_difference(pressed)
+
+    if changed:
+        # White keys first, then black keys on top, including those over a
+        # repainted white key's edges
+        blacks = set()
+        for p in changed:
+            if p not in _STRIP_RECTS:
+                continue
+            if is_black_key(p):
+                blacks.add(p)
+            else:
+                draw_rect(strip, NOTE_PERFECT if p in pressed else WHITE_KEY, _STRIP_RECTS[p])
+                blacks.update(_BLACK_NEIGHBORS[p])
+        for p in blacks:
+            draw_rect(strip, NOTE_PERFECT if p in pressed else BLACK_KEY, _STRIP_RECTS[p])
+        _strip_pressed = frozenset(pressed)
+
+    surface.blit(strip, (0, KEYBOARD_Y))
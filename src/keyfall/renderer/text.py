@@ -0,0 +1,46 @@
+"""Text drawn from pre-rendered glyphs, for short lines that change often."""
+
+from __future__ import annotations
+
+import pygame
+
+# Printable ASCII; anything else is rendered on first use
+_ASCII = "".join(map(chr, range(32, 127)))
+
+
+class GlyphAtlas:
+    """A monospace font's glyphs rendered once in one color.
+
+    render() lays a line out from the cached glyphs with blits, so a
+    changed string costs one blit per character instead of a font
+    rasterization pass.
+    """
+
+    __slots__ = ("_font", "_color", "_glyphs", "_height")
+
+    def __init__(self, font: pygame.font.Font, color: tuple[int, int, int]) -> None:
+        self._font = font
+        self._color = color
+        self._glyphs: dict[str, pygame.Surface] = {}
+        self._height = font.get_height()
+        for ch in _ASCII:
+            self._glyph(ch)
+
+    def _glyph(self, ch: str) -> pygame.Surface:
+        glyph = self._glyphs.get(ch)
+        if glyph is None:
+            glyph = self._glyphs[ch] = self._font.render(ch, True, self._color).convert_alpha()
+        return glyph
+
+    def render(self, text: str) -> pygame.Surface:
+        """Return ``text`` on a transparent surface, like Font.render(text, True, color)."""
+        glyph = self._glyph
+        blits = []
+        x = 0
+        for ch in text:
+            surf = glyph(ch)
+            blits.append((surf, (x, 0)))
+            x += surf.get_width()
+        line = pygame.Surface((max(x, 1), self._height), pygame.SRCALPHA)
+        line.blits(blits, doreturn=False)
+        return line
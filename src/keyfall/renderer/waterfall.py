@@ -2,12 +2,33 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+
 import pygame
 
 from keyfall.config import NOTE_FALL_SPEED
-from keyfall.models import Hand, NoteEvent, Song
+from keyfall.models import HAND_CODES, Hand, Song
 from keyfall.renderer.colors import NOTE_LEFT_HAND, NOTE_RIGHT_HAND
-from keyfall.renderer.keyboard import KEYBOARD_Y, is_black_key, key_width, key_x_position
+from keyfall.renderer.keyboard import KEYBOARD_Y, key_width, key_x_position
+
+# Pre-drawn rounded note bars by (color, width, height). Widths come from two
+# key sizes and heights from the song's few distinct durations, so this stays
+# small; it is cleared if it ever grows past the cap.
+_BAR_SPRITES: dict[tuple[tuple[int, int, int], int, int], pygame.Surface] = {}
+_MAX_BAR_SPRITES = 512
+_BAR_WIDTH = 0.85  # fraction of the key width
+_BAR_RADIUS = 3
+
+# Bar color indexed by NoteColumns.hand code; only the left hand differs
+_HAND_COLORS: tuple[tuple[int, int, int], ...] = tuple(
+    NOTE_LEFT_HAND if code == HAND_CODES[Hand.LEFT] else NOTE_RIGHT_HAND
+    for code in sorted(HAND_CODES.values())
+)
+
+
+def waterfall_area(surface: pygame.Surface) -> pygame.Rect:
+    """The part of ``surface`` above the keyboard that the note bars fall through."""
+    return pygame.Rect(0, 0, surface.get_width(), KEYBOARD_Y)
 
 
 def render_waterfall(
@@ -15,36 +36,54 @@ def render_waterfall(
     song: Song,
     playback_position: float,
     look_ahead: float = 3.0,
-) -> None:
-    """Draw falling note bars above the keyboard."""
-    for note in song.notes:
-        dt = note.start_time - playback_position
+) -> pygame.Rect:
+    """Draw falling note bars above the keyboard; returns the area drawn into."""
+    # Only notes starting inside the window, or early enough to still be
+    # sounding, can be visible. Bars are laid out from the song's columns,
+    # so no NoteEvent is touched per frame.
+    cols = song.columns()
+    starts = cols.start_time
+    lo = bisect_left(starts, playback_position - 0.5 - cols.max_duration)
+    hi = bisect_right(starts, playback_position + look_ahead, lo)
+    pixels_per_sec = KEYBOARD_Y / look_ahead
+    colors = _HAND_COLORS
+    blits = []
+    for start, duration, pitch, hand in zip(
+        starts[lo:hi], cols.duration[lo:hi], cols.pitch[lo:hi], cols.hand[lo:hi]
+    ):
+        dt = start - playback_position
         if dt > look_ahead:
             break
-        if dt + note.duration < -0.5:
+        if dt + duration < -0.5:
             continue
 
-        _draw_note_bar(surface, note, playback_position, look_ahead)
-
+        y_bottom = KEYBOARD_Y - dt * pixels_per_sec
+        bar_h = max(duration * pixels_per_sec, 6)
+        y_top = y_bottom - bar_h
 
-def _draw_note_bar(
-    surface: pygame.Surface,
-    note: NoteEvent,
-    position: float,
-    look_ahead: float,
-) -> None:
-    dt = note.start_time - position
-    pixels_per_sec = KEYBOARD_Y / look_ahead
+        w = key_width(pitch) * _BAR_WIDTH
+        x = key_x_position(pitch) - w / 2
 
-    y_bottom = KEYBOARD_Y - dt * pixels_per_sec
-    bar_h = max(note.duration * pixels_per_sec, 6)
-    y_top = y_bottom - bar_h
+        blits.append((_bar_sprite(colors[hand], int(w), int(bar_h)), (int(x), int(y_top))))
 
-    x_center = key_x_position(note.pitch)
-    w = key_width(note.pitch) * 0.85
-    x = x_center - w / 2
+    # Sounding bars reach past KEYBOARD_Y; clip them so the keyboard, which
+    # views only redraw when the held keys change, is left untouched
+    area = waterfall_area(surface)
+    clip = surface.get_clip()
+    surface.set_clip(area)
+    # One call for every bar instead of a draw call per note
+    surface.blits(blits, doreturn=False)
+    surface.set_clip(clip)
+    return area
 
-    color = NOTE_LEFT_HAND if note.hand == Hand.LEFT else NOTE_RIGHT_HAND
 
-    rect = pygame.Rect(int(x), int(y_top), int(w), int(bar_h))
-    pygame.draw.rect(surface, color, rect, border_radius=3)
+def _bar_sprite(color: tuple[int, int, int], w: int, h: int) -> pygame.Surface:
+    key = (color, w, h)
+    sprite = _BAR_SPRITES.get(key)
+    if sprite is None:
+        if len(_BAR_SPRITES) >= _MAX_BAR_SPRITES:
+            _BAR_SPRITES.clear()
+        sprite = pygame.Surface((w, h), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(sprite, color, (0, 0, w, h), border_radius=_BAR_RADIUS)
+        _BAR_SPRITES[key] = sprite
+    return sprite
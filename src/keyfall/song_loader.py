@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from enum import Enum, auto
+from operator import itemgetter
 from pathlib import Path
+from types import ModuleType
 
 import mido
 
@@ -61,64 +63,88 @@ def _assign_hand(
 
 def _load_midi(path: Path, hand_split: HandSplitStrategy = HandSplitStrategy.BY_TRACK) -> Song:
     mid = mido.MidiFile(str(path))
+    ticks_per_beat = mid.ticks_per_beat
     song = Song(
         title=path.stem,
-        ticks_per_beat=mid.ticks_per_beat,
+        ticks_per_beat=ticks_per_beat,
     )
 
     tempo = 500_000  # default 120 BPM
     song.tempo_changes.append(TempoChange(time=0.0, bpm=mido.tempo2bpm(tempo)))
+    # Seconds per tick at the current tempo, the factor mido.tick2second applies;
+    # recomputed only on a tempo change instead of once per message
+    sec_per_tick = tempo * 1e-6 / ticks_per_beat
+
+    # Finished notes as (start_time, pitch, duration, velocity, channel, track)
+    closed: list[tuple[float, int, float, int, int, int]] = []
+    close = closed.append
 
     for track_idx, track in enumerate(mid.tracks):
         abs_time = 0.0
         pending: dict[int, tuple[float, int, int]] = {}  # pitch -> (start_time, velocity, channel)
+        pop_pending = pending.pop
 
         for msg in track:
-            abs_time += mido.tick2second(msg.time, mid.ticks_per_beat, tempo)
+            if msg.time:
+                abs_time += msg.time * sec_per_tick
+            msg_type = msg.type
 
-            if msg.type == "set_tempo":
+            if msg_type == "note_on" and msg.velocity > 0:
+                pitch = msg.note
+                # Close any existing note on the same pitch (overlapping notes)
+                started = pop_pending(pitch, None)
+                if started is not None:
+                    start, vel, ch = started
+                    close((start, pitch, max(abs_time - start, 0.01), vel, ch, track_idx))
+                pending[pitch] = (abs_time, msg.velocity, getattr(msg, 'channel', 0))
+
+            elif msg_type == "note_off" or msg_type == "note_on":
+                pitch = msg.note
+                started = pop_pending(pitch, None)
+                if started is not None:
+                    start, vel, ch = started
+                    close((start, pitch, max(abs_time - start, 0.01), vel, ch, track_idx))
+
+            elif msg_type == "set_tempo":
                 tempo = msg.tempo
+                sec_per_tick = tempo * 1e-6 / ticks_per_beat
                 song.tempo_changes.append(TempoChange(time=abs_time, bpm=mido.tempo2bpm(tempo)))
 
-            elif msg.type == "note_on" and msg.velocity > 0:
-                # Close any existing note on the same pitch (overlapping notes)
-                if msg.note in pending:
-                    start, vel, ch = pending.pop(msg.note)
-                    song.notes.append(
-                        NoteEvent(
-                            pitch=msg.note,
-                            start_time=start,
-                            duration=max(abs_time - start, 0.01),
-                            velocity=vel,
-                            hand=_assign_hand(msg.note, track_idx, ch, hand_split),
-                            track=track_idx,
-                        )
-                    )
-                pending[msg.note] = (abs_time, msg.velocity, getattr(msg, 'channel', 0))
-
-            elif msg.type in ("note_off", "note_on"):
-                if msg.note in pending:
-                    start, vel, ch = pending.pop(msg.note)
-                    song.notes.append(
-                        NoteEvent(
-                            pitch=msg.note,
-                            start_time=start,
-                            duration=max(abs_time - start, 0.01),
-                            velocity=vel,
-                            hand=_assign_hand(msg.note, track_idx, ch, hand_split),
-                            track=track_idx,
-                        )
-                    )
-
-    song.notes.sort(key=lambda n: n.start_time)
+    # Sort the plain tuples (stable, by start time) and build each NoteEvent once
+    closed.sort(key=itemgetter(0))
+    song.notes = [
+        NoteEvent(
+            pitch=pitch,
+            start_time=start,
+            duration=duration,
+            velocity=vel,
+            hand=_assign_hand(pitch, track_idx, ch, hand_split),
+            track=track_idx,
+        )
+        for start, pitch, duration, vel, ch, track_idx in closed
+    ]
     if song.notes:
         last = song.notes[-1]
         song.duration = last.start_time + last.duration
     return song
 
 
+# (converter, tempo) submodules of music21, imported on the first MusicXML load
+_music21: tuple[ModuleType, ModuleType] | None = None
+
+
+def _get_music21() -> tuple[ModuleType, ModuleType]:
+    """Import music21 once, on first use; it is slow to import and MIDI-only use never needs it."""
+    global _music21
+    if _music21 is None:
+        from music21 import converter, tempo
+
+        _music21 = (converter, tempo)
+    return _music21
+
+
 def _load_musicxml(path: Path) -> Song:
-    from music21 import converter, note as m21note, tempo as m21tempo
+    converter, m21tempo = _get_music21()
 
     score = converter.parse(str(path))
     song = Song(title=path.stem)
@@ -126,23 +152,33 @@ def _load_musicxml(path: Path) -> Song:
     for mm in score.flatten().getElementsByClass(m21tempo.MetronomeMark):
         song.tempo_changes.append(TempoChange(time=float(mm.offset), bpm=mm.number))
 
+    # Notes as (start_time, pitch, duration, velocity, part index); the
+    # per-element fields are read once for all pitches of a chord
+    rows: list[tuple[float, int, float, int, int]] = []
+    add = rows.append
     for part_idx, part in enumerate(score.parts):
-        hand = Hand.RIGHT if part_idx == 0 else Hand.LEFT
         for n in part.flatten().notes:
             pitches = n.pitches if hasattr(n, "pitches") else [n.pitch]
+            start = float(n.offset)
+            duration = float(n.duration.quarterLength)
+            velocity = n.volume.velocity or 80
             for p in pitches:
-                song.notes.append(
-                    NoteEvent(
-                        pitch=p.midi,
-                        start_time=float(n.offset),
-                        duration=float(n.duration.quarterLength),
-                        velocity=n.volume.velocity or 80,
-                        hand=hand,
-                        track=part_idx,
-                    )
-                )
-
-    song.notes.sort(key=lambda n: n.start_time)
+                add((start, p.midi, duration, velocity, part_idx))
+
+    # Sort the plain tuples (stable, by start time) and build each NoteEvent once
+    rows.sort(key=itemgetter(0))
+    right, left = Hand.RIGHT, Hand.LEFT
+    song.notes = [
+        NoteEvent(
+            pitch=pitch,
+            start_time=start,
+            duration=duration,
+            velocity=velocity,
+            hand=right if part_idx == 0 else left,
+            track=part_idx,
+        )
+        for start, pitch, duration, velocity, part_idx in rows
+    ]
     if song.notes:
         last = song.notes[-1]
         song.duration = last.start_time + last.duration
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, fields, replace
 from typing import TYPE_CHECKING, Any, Literal, Protocol, runtime_checkable
 
 import pygame
@@ -16,7 +16,7 @@ if TYPE_CHECKING:
     from keyfall.progress import ProgressTracker
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ViewContext:
     """Shared state passed to views on entry."""
 
@@ -33,6 +33,35 @@ class ViewContext:
     songs_dir: str = ""
 
 
+_CONTEXT_FIELDS = frozenset(f.name for f in fields(ViewContext))
+
+
+# Events after which the window has to be repainted in full: it was uncovered,
+# restored or shown again, and views that push only changed rects would leave
+# stale pixels on screen. Pygame 2 posts these in place of SDL's WINDOWEVENT.
+REDRAW_EVENTS = (
+    pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN,
+)
+
+# Event types the gameplay views keep in the SDL queue while they are active.
+# KEYUP still feeds KeyboardInput.
+GAMEPLAY_EVENTS = [pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, *REDRAW_EVENTS]
+
+
+def block_non_gameplay_events() -> None:
+    """Keep only GAMEPLAY_EVENTS in the SDL queue; undone by allow_all_events().
+
+    Mouse motion and other events no view reads then never become Python
+    objects, and cannot crowd key presses out of the queue.
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(GAMEPLAY_EVENTS)
+
+
+def allow_all_events() -> None:
+    pygame.event.set_allowed(None)
+
+
 @dataclass
 class ViewAction:
     """Navigation command returned by views."""
@@ -63,7 +92,9 @@ class View(Protocol):
     def on_exit(self) -> None: ...
     def handle_event(self, event: pygame.event.Event) -> ViewAction | None: ...
     def update(self, dt: float) -> ViewAction | None: ...
-    def draw(self, surface: pygame.Surface) -> None: ...
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
+        """Draw the frame; return the rects that changed, or None if all of it may have."""
+        ...
 
 
 class ViewManager:
@@ -71,15 +102,18 @@ class ViewManager:
 
     def __init__(self, context: ViewContext) -> None:
         self._registry: dict[str, type] = {}
+        # Display names read from the instance made at registration
+        self._display_names: dict[str, str] = {}
         self._stack: list[tuple[View, ViewContext]] = []
         self._context = context
 
     def register(self, view_cls: type) -> None:
         instance = view_cls()
         self._registry[instance.name] = view_cls
+        self._display_names[instance.name] = instance.display_name
 
     def list_views(self) -> list[tuple[str, str]]:
-        return [(name, cls().display_name) for name, cls in self._registry.items()]
+        return list(self._display_names.items())
 
     def push(self, view_name: str, **context_overrides: Any) -> None:
         if self._stack:
@@ -111,15 +145,41 @@ class ViewManager:
         action = view.handle_event(event)
         return self._process_action(action)
 
+    def handle_event_batch(self, events: list[pygame.event.Event]) -> bool:
+        """Dispatch a frame's events in order; False if any of them quits.
+
+        The active view is looked up per event, so events after a push or
+        pop go to the view that is then on top, as with handle_event().
+        """
+        keep_running = True
+        handle_event = self.handle_event
+        for event in events:
+            if not handle_event(event):
+                keep_running = False
+        return keep_running
+
     def update(self, dt: float) -> bool:
         if (view := self.active_view) is None:
             return False
         action = view.update(dt)
         return self._process_action(action)
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
+        """Draw the active view; returns its changed rects (None for the whole surface)."""
         if (view := self.active_view) is not None:
-            view.draw(surface)
+            return view.draw(surface)
+        return None
+
+    def invalidate(self) -> None:
+        """Make the active view redraw everything it caches on its next draw().
+
+        Views that return changed rects from draw() provide an invalidate()
+        method for this; views without one already redraw every frame.
+        """
+        view = self.active_view
+        invalidate = getattr(view, "invalidate", None)
+        if invalidate is not None:
+            invalidate()
 
     def _process_action(self, action: ViewAction | None) -> bool:
         if action is None:
@@ -135,25 +195,11 @@ class ViewManager:
         return True
 
     def _patched_context(self, overrides: dict[str, Any]) -> ViewContext:
-        if not overrides:
+        # Overrides naming no context field are ignored
+        valid = {key: val for key, val in overrides.items() if key in _CONTEXT_FIELDS}
+        if not valid:
             return self._context
-        ctx = ViewContext(
-            screen_size=self._context.screen_size,
-            midi_input=self._context.midi_input,
-            audio=self._context.audio,
-            progress=self._context.progress,
-            plugin_manager=self._context.plugin_manager,
-            keyboard_input=self._context.keyboard_input,
-            song=self._context.song,
-            section=self._context.section,
-            hand=self._context.hand,
-            tempo_scale=self._context.tempo_scale,
-            songs_dir=self._context.songs_dir,
-        )
-        for key, val in overrides.items():
-            if hasattr(ctx, key):
-                setattr(ctx, key, val)
-        return ctx
+        return replace(self._context, **valid)
 
 
 def layout_regions(
@@ -161,22 +207,35 @@ def layout_regions(
     specs: list[tuple[str, Literal["top", "bottom", "left", "right"], int]],
 ) -> dict[str, pygame.Rect]:
     """Carve out named regions from a total rect. Remainder is 'center'."""
+    # One working rect, shrunk in place as each region is carved off
     remaining = total.copy()
     regions: dict[str, pygame.Rect] = {}
 
     for name, anchor, size in specs:
         if anchor == "top":
             regions[name] = pygame.Rect(remaining.x, remaining.y, remaining.w, size)
-            remaining = pygame.Rect(remaining.x, remaining.y + size, remaining.w, remaining.h - size)
+            remaining.y += size
+            remaining.h -= size
         elif anchor == "bottom":
             regions[name] = pygame.Rect(remaining.x, remaining.bottom - size, remaining.w, size)
-            remaining = pygame.Rect(remaining.x, remaining.y, remaining.w, remaining.h - size)
+            remaining.h -= size
         elif anchor == "left":
             regions[name] = pygame.Rect(remaining.x, remaining.y, size, remaining.h)
-            remaining = pygame.Rect(remaining.x + size, remaining.y, remaining.w - size, remaining.h)
+            remaining.x += size
+            remaining.w -= size
         elif anchor == "right":
             regions[name] = pygame.Rect(remaining.right - size, remaining.y, size, remaining.h)
-            remaining = pygame.Rect(remaining.x, remaining.y, remaining.w - size, remaining.h)
+            remaining.w -= size
 
     regions["center"] = remaining
     return regions
+
+
+def mask_pitches(mask: int) -> frozenset[int]:
+    """Return the pitches whose bits are set in ``mask`` (bit ``p`` for pitch ``p``)."""
+    pitches = []
+    while mask:
+        low = mask & -mask
+        pitches.append(low.bit_length() - 1)
+        mask ^= low
+    return frozenset(pitches)
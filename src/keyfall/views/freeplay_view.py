@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import time
+from bisect import bisect_left, insort
+from collections import deque
 
 import pygame
 
@@ -13,25 +15,54 @@ from keyfall.views.base import ViewAction, ViewContext
 
 _NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
+# Scientific pitch name of every MIDI note, e.g. 60 -> "C4"
+_PITCH_NAMES = [f"{_NOTE_NAMES[p % 12]}{p // 12 - 1}" for p in range(128)]
+
+# Recent chords shown in the history line
+_CHORD_HISTORY_LEN = 10
+
 
 class FreePlayView:
     name = "freeplay"
     display_name = "Free Play"
+    __slots__ = (
+        "_context", "_mode", "_pressed", "_pressed_sorted", "_chord_history", "_chord",
+        "_chord_surf", "_font", "_chord_font", "_title_surf", "_rec_surf", "_hint_surf",
+        "_dirty",
+    )
 
     def __init__(self) -> None:
         self._context: ViewContext | None = None
         self._mode: FreePlayMode | None = None
         self._pressed: set[int] = set()
-        self._chord_history: list[str] = []
+        self._pressed_sorted: list[int] = []  # _pressed in pitch order, for the held-notes line
+        self._chord_history: deque[str] = deque(maxlen=_CHORD_HISTORY_LEN)
+        self._chord: str | None = None  # the mode's chord as of this frame's update
+        # Last rendered chord label: (chord, color, surface)
+        self._chord_surf: tuple[str, tuple[int, int, int], pygame.Surface] | None = None
         self._font: pygame.font.Font | None = None
         self._chord_font: pygame.font.Font | None = None
+        # Fixed labels, rendered once per entry
+        self._title_surf: pygame.Surface | None = None
+        self._rec_surf: pygame.Surface | None = None
+        self._hint_surf: pygame.Surface | None = None
+        # Nothing moves on its own here; frames without input skip drawing
+        self._dirty = True
 
     def on_enter(self, context: ViewContext) -> None:
         self._context = context
         self._font = pygame.font.SysFont("monospace", 20)
         self._chord_font = pygame.font.SysFont("monospace", 48)
+        self._title_surf = self._font.render("Free Play", True, colors_mod.NOTE_PERFECT)
+        self._rec_surf = self._font.render("REC", True, (220, 60, 60))
+        self._hint_surf = self._font.render(
+            "R: toggle recording | Esc: back to menu", True, (80, 80, 100),
+        )
         self._pressed = set()
-        self._chord_history = []
+        self._pressed_sorted = []
+        self._chord_history = deque(maxlen=_CHORD_HISTORY_LEN)
+        self._chord = None
+        self._dirty = True
         self._mode = FreePlayMode()
 
     def on_exit(self) -> None:
@@ -39,6 +70,8 @@ class FreePlayView:
             self._context.audio.all_notes_off()
 
     def handle_event(self, event: pygame.event.Event) -> ViewAction | None:
+        # Any event may change the screen (or expose the window), so redraw
+        self._dirty = True
         if event.type != pygame.KEYDOWN:
             return None
 
@@ -62,63 +95,83 @@ class FreePlayView:
             return None
 
         # Poll MIDI and keyboard input
-        for source in (self._context.midi_input, self._context.keyboard_input):
+        context = self._context
+        mode = self._mode
+        pressed = self._pressed
+        pressed_sorted = self._pressed_sorted
+        sounds: list[tuple[int, int]] = []  # (pitch, velocity), 0 for a release
+        # Bound once, not looked up per event of a chord burst
+        press, release = pressed.add, pressed.remove
+        mode_on, mode_off = mode.note_on, mode.note_off
+        for source in (context.midi_input, context.keyboard_input):
             if source is None:
                 continue
-            while True:
-                evt = source.poll()
-                if evt is None:
-                    break
-                if evt.is_note_on:
-                    self._pressed.add(evt.pitch)
-                    self._mode.note_on(evt.pitch, evt.velocity)
-                    if self._context.audio:
-                        self._context.audio.note_on(evt.pitch, evt.velocity)
+            notes = source.poll_notes()
+            for pitch, velocity in notes:
+                if velocity:
+                    if pitch not in pressed:
+                        press(pitch)
+                        insort(pressed_sorted, pitch)
+                    mode_on(pitch, velocity)
                 else:
-                    self._pressed.discard(evt.pitch)
-                    self._mode.note_off(evt.pitch)
-                    if self._context.audio:
-                        self._context.audio.note_off(evt.pitch)
+                    if pitch in pressed:
+                        release(pitch)
+                        del pressed_sorted[bisect_left(pressed_sorted, pitch)]
+                    mode_off(pitch)
+            sounds += notes
+        if sounds and context.audio:
+            context.audio.play_notes(sounds)
+
+        # The chord only changes with the held keys, so frames without input skip this
+        if sounds:
+            self._dirty = True
+            chord = self._chord = mode.get_active_chord()
+            if chord and (not self._chord_history or self._chord_history[-1] != chord):
+                self._chord_history.append(chord)
+
+        mode.update(dt)
+        return None
 
-        # Chord history
-        chord = self._mode.get_active_chord()
-        if chord and (not self._chord_history or self._chord_history[-1] != chord):
-            self._chord_history.append(chord)
-            if len(self._chord_history) > 20:
-                self._chord_history.pop(0)
+    def invalidate(self) -> None:
+        """Redraw the whole screen on the next draw(), e.g. after the window was exposed."""
+        self._dirty = True
 
-        self._mode.update(dt)
-        return None
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
+        if not self._dirty:
+            return []  # nothing changed since the last frame
+        self._dirty = False
 
-    def draw(self, surface: pygame.Surface) -> None:
         surface.fill(colors_mod.BG)
         w, h = surface.get_size()
 
         # Title bar
-        if self._font:
-            title = self._font.render("Free Play", True, colors_mod.NOTE_PERFECT)
-            surface.blit(title, (20, 15))
+        if self._title_surf and self._rec_surf:
+            surface.blit(self._title_surf, (20, 15))
 
             if self._mode and self._mode.is_recording:
-                rec_text = self._font.render("REC", True, (220, 60, 60))
+                rec_text = self._rec_surf
                 surface.blit(rec_text, (w - rec_text.get_width() - 20, 15))
 
         # Chord display
-        chord = self._mode.get_active_chord() if self._mode else None
+        chord = self._chord
         if chord and self._chord_font:
-            chord_surf = self._chord_font.render(chord, True, colors_mod.NOTE_RIGHT_HAND)
+            color = colors_mod.NOTE_RIGHT_HAND
+            cached = self._chord_surf
+            if cached is None or cached[0] != chord or cached[1] != color:
+                cached = (chord, color, self._chord_font.render(chord, True, color))
+                self._chord_surf = cached
+            chord_surf = cached[2]
             surface.blit(chord_surf, (w // 2 - chord_surf.get_width() // 2, 80))
 
         # Chord history
         if self._font and self._chord_history:
-            history_text = "  ".join(self._chord_history[-10:])
+            history_text = "  ".join(self._chord_history)
             hist_surf = self._font.render(history_text, True, (120, 120, 140))
             surface.blit(hist_surf, (20, 160))
 
         # Note names of currently held keys
-        if self._font and self._pressed:
-            names = sorted(self._pressed)
-            note_str = ", ".join(f"{_NOTE_NAMES[p % 12]}{p // 12 - 1}" for p in names)
+        if self._font and self._pressed_sorted:
+            note_str = ", ".join([_PITCH_NAMES[p] for p in self._pressed_sorted])
             notes_surf = self._font.render(note_str, True, colors_mod.HUD_TEXT)
             surface.blit(notes_surf, (20, 200))
 
@@ -126,6 +179,5 @@ class FreePlayView:
         render_keyboard(surface, self._pressed)
 
         # Controls
-        if self._font:
-            hint = self._font.render("R: toggle recording | Esc: back to menu", True, (80, 80, 100))
-            surface.blit(hint, (20, h - 150))
+        if self._hint_surf:
+            surface.blit(self._hint_surf, (20, h - 150))
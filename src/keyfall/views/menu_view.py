@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pygame
@@ -10,10 +11,46 @@ from keyfall.renderer import colors as colors_mod
 from keyfall.song_loader import load_song
 from keyfall.views.base import ViewAction, ViewContext
 
+# Song file extensions, in the order their groups are listed
+_SONG_EXTENSIONS = (".mid", ".midi", ".musicxml", ".xml")
+
+# songs dir -> (its mtime_ns when scanned, song files found)
+_song_cache: dict[Path, tuple[int, list[Path]]] = {}
+
+
+def _list_songs(songs_path: Path) -> list[Path]:
+    """Song files in ``songs_path``, grouped by extension and sorted within each group.
+
+    The directory is only re-read when its mtime changes, which adding,
+    removing or renaming a file does.
+    """
+    mtime = songs_path.stat().st_mtime_ns
+    cached = _song_cache.get(songs_path)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
+
+    groups: dict[str, list[Path]] = {ext: [] for ext in _SONG_EXTENSIONS}
+    with os.scandir(songs_path) as entries:
+        for entry in entries:
+            # Extensions match case-insensitively, as the glob this replaces
+            # did on Windows
+            _, dot, ext = entry.name.rpartition(".")
+            group = groups.get((dot + ext).lower())
+            if group is not None and entry.is_file():
+                group.append(songs_path / entry.name)
+    files = [path for ext in _SONG_EXTENSIONS for path in sorted(groups[ext])]
+    _song_cache[songs_path] = (mtime, files)
+    return list(files)
+
 
 class MenuView:
     name = "menu"
     display_name = "Main Menu"
+    __slots__ = (
+        "_context", "_song_files", "_selected", "_mode", "_modes", "_mode_targets", "_font",
+        "_title_font", "_title_surf", "_header_surf", "_no_songs_surf", "_legend_surf",
+        "_row_surfs", "_dirty",
+    )
 
     def __init__(self) -> None:
         self._context: ViewContext | None = None
@@ -24,26 +61,46 @@ class MenuView:
         self._mode_targets = ["waterfall", "practice", "freeplay"]
         self._font: pygame.font.Font | None = None
         self._title_font: pygame.font.Font | None = None
+        # Fixed labels, rendered once per entry
+        self._title_surf: pygame.Surface | None = None
+        self._header_surf: pygame.Surface | None = None
+        self._no_songs_surf: pygame.Surface | None = None
+        self._legend_surf: pygame.Surface | None = None
+        # Rendered song rows by (index, selected); rebuilt with the song list
+        self._row_surfs: dict[tuple[int, bool], pygame.Surface] = {}
+        # The menu only changes on input, so frames without any skip drawing
+        self._dirty = True
 
     def on_enter(self, context: ViewContext) -> None:
         self._context = context
         self._font = pygame.font.SysFont("monospace", 20)
         self._title_font = pygame.font.SysFont("monospace", 36)
+        self._title_surf = self._title_font.render("KeyFall", True, colors_mod.NOTE_PERFECT)
+        self._header_surf = self._font.render("Songs:", True, colors_mod.HUD_TEXT)
+        self._no_songs_surf = self._font.render(
+            "No songs found. Set songs_dir in config.", True, (180, 80, 80),
+        )
+        self._legend_surf = self._font.render(
+            "Up/Down: select | Enter: launch | Tab: mode | Esc: quit", True, (120, 120, 140),
+        )
         self._scan_songs()
+        self._dirty = True
 
     def on_exit(self) -> None:
         pass
 
     def _scan_songs(self) -> None:
         self._song_files = []
+        self._row_surfs = {}
         if not self._context or not self._context.songs_dir:
             return
         songs_path = Path(self._context.songs_dir)
         if songs_path.is_dir():
-            for ext in ("*.mid", "*.midi", "*.musicxml", "*.xml"):
-                self._song_files.extend(sorted(songs_path.glob(ext)))
+            self._song_files = _list_songs(songs_path)
 
     def handle_event(self, event: pygame.event.Event) -> ViewAction | None:
+        # Any event may change the screen (or expose the window), so redraw
+        self._dirty = True
         if event.type != pygame.KEYDOWN:
             return None
 
@@ -85,15 +142,31 @@ class MenuView:
     def update(self, dt: float) -> ViewAction | None:
         return None
 
-    def draw(self, surface: pygame.Surface) -> None:
-        if not self._font or not self._title_font:
-            return
+    def _song_row(self, i: int) -> pygame.Surface:
+        """The rendered list row for song ``i``, cached per (index, selected)."""
+        selected = i == self._selected
+        row = self._row_surfs.get((i, selected))
+        if row is None:
+            prefix = "> " if selected else "  "
+            color = colors_mod.NOTE_PERFECT if selected else colors_mod.HUD_TEXT
+            row = self._font.render(f"{prefix}{self._song_files[i].stem}", True, color)
+            self._row_surfs[(i, selected)] = row
+        return row
+
+    def invalidate(self) -> None:
+        """Redraw the whole screen on the next draw(), e.g. after the window was exposed."""
+        self._dirty = True
+
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
+        if not self._font or not self._title_font or not self._dirty:
+            return []  # nothing changed since the last frame
+        self._dirty = False
 
         surface.fill(colors_mod.BG)
         w, h = surface.get_size()
 
         # Title
-        title = self._title_font.render("KeyFall", True, colors_mod.NOTE_PERFECT)
+        title = self._title_surf
         surface.blit(title, (w // 2 - title.get_width() // 2, 30))
 
         # Mode selector
@@ -104,22 +177,18 @@ class MenuView:
 
         # Song list
         if self._song_files:
-            header = self._font.render("Songs:", True, colors_mod.HUD_TEXT)
-            surface.blit(header, (40, 140))
+            surface.blit(self._header_surf, (40, 140))
 
+            # Rows from y=175 down to h - 80, scrolled to keep the selection in view
+            n_files = len(self._song_files)
+            max_visible = max(1, (h - 80 - 175) // 28 + 1)
+            start = max(0, min(self._selected - max_visible // 2, n_files - max_visible))
             y = 175
-            for i, path in enumerate(self._song_files):
-                prefix = "> " if i == self._selected else "  "
-                color = colors_mod.NOTE_PERFECT if i == self._selected else colors_mod.HUD_TEXT
-                text = self._font.render(f"{prefix}{path.stem}", True, color)
-                surface.blit(text, (40, y))
+            for i in range(start, min(start + max_visible, n_files)):
+                surface.blit(self._song_row(i), (40, y))
                 y += 28
-                if y > h - 80:
-                    break
         else:
-            no_songs = self._font.render("No songs found. Set songs_dir in config.", True, (180, 80, 80))
-            surface.blit(no_songs, (40, 160))
+            surface.blit(self._no_songs_surf, (40, 160))
 
         # Controls legend
-        legend = self._font.render("Up/Down: select | Enter: launch | Tab: mode | Esc: quit", True, (120, 120, 140))
-        surface.blit(legend, (40, h - 40))
+        surface.blit(self._legend_surf, (40, h - 40))
@@ -4,45 +4,82 @@ from __future__ import annotations
 
 import pygame
 
-from keyfall.evaluator import evaluate_hit
+from keyfall.evaluator import sweep_pending
 from keyfall.models import Hand, HitGrade, NoteEvent, SessionStats, Song
 from keyfall.notation import render_notation
 from keyfall.playback import PlaybackEngine, select_section
 from keyfall.renderer import colors as colors_mod
 from keyfall.renderer.hud import render_hud
-from keyfall.renderer.keyboard import render_keyboard
-from keyfall.renderer.waterfall import render_waterfall
-from keyfall.views.base import ViewAction, ViewContext, layout_regions
+from keyfall.renderer.keyboard import KEYBOARD_Y, render_keyboard
+from keyfall.renderer.text import GlyphAtlas
+from keyfall.renderer.waterfall import render_waterfall, waterfall_area
+from keyfall.views.base import (
+    ViewAction,
+    ViewContext,
+    allow_all_events,
+    block_non_gameplay_events,
+    layout_regions,
+    mask_pitches,
+)
 
 
 class PracticeView:
     name = "practice"
     display_name = "Practice Mode"
+    __slots__ = (
+        "_context", "_engine", "_full_song", "_stats", "_pressed", "_pressed_cache", "_streak",
+        "_pending_notes", "_stats_dirty", "_font", "_hint_surf", "_show_notation", "_looping",
+        "_section_start", "_section_end", "_hit_results", "_loop_count", "_layout_key", "_layout",
+        "_status_key", "_status_surf", "_status_glyphs", "_keyboard_key",
+    )
 
     def __init__(self) -> None:
         self._context: ViewContext | None = None
         self._engine: PlaybackEngine | None = None
         self._full_song: Song | None = None
         self._stats = SessionStats()
-        self._pressed: set[int] = set()
+        # Held pitches as a bitmask (bit p set while pitch p is down), and the
+        # (mask, frozenset) last built from it for the engine and keyboard
+        self._pressed: int = 0
+        self._pressed_cache: tuple[int, frozenset[int]] = (0, frozenset())
         self._streak: int = 0
         self._pending_notes: list[NoteEvent] = []
+        # Set when grades were counted since accuracy was last recomputed
+        self._stats_dirty: bool = False
         self._font: pygame.font.Font | None = None
+        self._hint_surf: pygame.Surface | None = None  # controls hint, rendered once per entry
         self._show_notation: bool = True
         self._looping: bool = False
         self._section_start: int = 1
         self._section_end: int = 4
         self._hit_results: dict[int, HitGrade] = {}
         self._loop_count: int = 0
+        # Screen regions from layout_regions(), and the (w, h, show_notation) they were built for
+        self._layout_key: tuple[int, int, bool] | None = None
+        self._layout: dict[str, pygame.Rect] = {}
+        # Rendered status line and the playback/loop state it shows
+        self._status_key: tuple | None = None
+        self._status_surf: pygame.Surface | None = None
+        self._status_glyphs: GlyphAtlas | None = None
+        # (width, height, held-key mask) the keyboard on screen was drawn for
+        self._keyboard_key: tuple[int, int, int] | None = None
 
     def on_enter(self, context: ViewContext) -> None:
         self._context = context
         self._font = pygame.font.SysFont("monospace", 18)
+        self._status_surf = None
+        self._status_glyphs = GlyphAtlas(self._font, colors_mod.HUD_TEXT)
+        self._hint_surf = self._font.render(
+            "N:notation L:loop [/]:section W:wait +/-:tempo 1/2/3:hand R:restart",
+            True, (80, 80, 100),
+        )
         self._full_song = context.song or Song(title="Empty")
         self._stats = SessionStats(song_title=self._full_song.title)
         self._streak = 0
-        self._pressed = set()
+        self._pressed = 0
         self._pending_notes = []
+        self._stats_dirty = False
+        self._keyboard_key = None
         self._hit_results = {}
         self._loop_count = 0
 
@@ -50,6 +87,7 @@ class PracticeView:
             self._section_start, self._section_end = context.section
 
         self._build_engine()
+        block_non_gameplay_events()
 
     def _build_engine(self) -> None:
         song = self._full_song
@@ -57,15 +95,21 @@ class PracticeView:
             return
         if self._looping:
             song = select_section(song, self._section_start, self._section_end)
+        self._silence()
         self._engine = PlaybackEngine(song)
         if self._context:
             self._engine.set_tempo_scale(self._context.tempo_scale)
             self._engine.active_hand = self._context.hand
         self._engine.wait_mode = True  # default for practice
 
-    def on_exit(self) -> None:
+    def _silence(self) -> None:
+        """Stop all audio, including auto-play notes queued ahead of the position."""
         if self._context and self._context.audio:
             self._context.audio.all_notes_off()
+
+    def on_exit(self) -> None:
+        allow_all_events()
+        self._silence()
         if self._context and self._context.progress:
             self._update_accuracy()
             self._context.progress.save_session(self._stats)
@@ -82,6 +126,7 @@ class PracticeView:
             return ViewAction(kind="pop")
         elif event.key == pygame.K_SPACE:
             engine.paused = not engine.paused
+            self._silence()
         elif event.key == pygame.K_w:
             engine.wait_mode = not engine.wait_mode
         elif event.key == pygame.K_l:
@@ -120,58 +165,51 @@ class PracticeView:
             return None
 
         # Poll MIDI and keyboard input
-        if self._context:
-            for source in (self._context.midi_input, self._context.keyboard_input):
+        context = self._context
+        audio = context.audio if context else None
+        if context:
+            pressed = self._pressed
+            sounds: list[tuple[int, int]] = []  # (pitch, velocity), 0 for a release
+            for source in (context.midi_input, context.keyboard_input):
                 if source is None:
                     continue
-                while True:
-                    evt = source.poll()
-                    if evt is None:
-                        break
-                    if evt.is_note_on:
-                        self._pressed.add(evt.pitch)
-                        if self._context.audio:
-                            self._context.audio.note_on(evt.pitch, evt.velocity)
+                notes = source.poll_notes()
+                for pitch, velocity in notes:
+                    if velocity:
+                        pressed |= 1 << pitch
                     else:
-                        self._pressed.discard(evt.pitch)
-                        if self._context.audio:
-                            self._context.audio.note_off(evt.pitch)
-
-        newly_active = engine.update(dt, self._pressed)
-
-        for note in newly_active:
-            self._pending_notes.append(note)
-            # Auto-play inactive hand
-            if self._context and self._context.audio:
-                if engine.active_hand != Hand.BOTH and note.hand != engine.active_hand:
-                    self._context.audio.play_note_event(note)
-
-        still_pending: list[NoteEvent] = []
-        for note in self._pending_notes:
-            age = engine.position - note.start_time
-            if age > 0.3:
-                self._stats.missed += 1
-                self._streak = 0
-            elif note.pitch in self._pressed:
-                result = evaluate_hit(note, note.pitch, engine.position)
-                if result.grade == HitGrade.PERFECT:
-                    self._stats.perfect += 1
-                    self._streak += 1
-                elif result.grade == HitGrade.GOOD:
-                    self._stats.good += 1
-                    self._streak += 1
-                elif result.grade == HitGrade.OK:
-                    self._stats.ok += 1
-                    self._streak += 1
-                else:
-                    self._stats.missed += 1
-                    self._streak = 0
-                self._stats.max_streak = max(self._stats.max_streak, self._streak)
-            else:
-                still_pending.append(note)
-                continue
-            self._update_accuracy()
-        self._pending_notes = still_pending
+                        pressed &= ~(1 << pitch)
+                sounds += notes
+            self._pressed = pressed
+            if sounds and audio:
+                audio.play_notes(sounds)
+
+        newly_active = engine.update(dt, self.pressed_set)
+        scheduled = engine.schedule_ahead(autoplay_only=True)
+
+        self._pending_notes.extend(newly_active)
+
+        # Auto-play inactive hand: timed ahead while playing, on arrival in wait mode
+        if audio and engine.active_hand is not Hand.BOTH:
+            for delay, note in scheduled:
+                audio.schedule_note_event(note, delay)
+            if engine.wait_mode:
+                for note in engine.autoplay_activated():
+                    audio.play_note_event(note)
+            audio.flush_pending_offs()
+
+        counts, self._streak, peak = sweep_pending(
+            self._pending_notes, self._pressed, engine.position, self._streak
+        )
+        stats = self._stats
+        if peak > stats.max_streak:
+            stats.max_streak = peak
+        if any(counts):
+            stats.perfect += counts[0]
+            stats.good += counts[1]
+            stats.ok += counts[2]
+            stats.missed += counts[3]
+            self._stats_dirty = True
 
         # Loop restart
         if engine.finished and not self._pending_notes:
@@ -183,27 +221,47 @@ class PracticeView:
 
         return None
 
+    @property
+    def pressed_set(self) -> frozenset[int]:
+        """The held pitches as a set, rebuilt only when the mask has changed."""
+        mask, pitches = self._pressed_cache
+        if mask != self._pressed:
+            pitches = mask_pitches(self._pressed)
+            self._pressed_cache = (self._pressed, pitches)
+        return pitches
+
     def _update_accuracy(self) -> None:
+        self._stats_dirty = False
         hit = self._stats.perfect + self._stats.good + self._stats.ok
         total = hit + self._stats.missed
         self._stats.total_notes = total
         self._stats.accuracy_pct = (hit / total * 100.0) if total > 0 else 0.0
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def invalidate(self) -> None:
+        """Redraw the keyboard on the next draw(), e.g. after the window was exposed."""
+        self._keyboard_key = None
+
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
         engine = self._engine
         if engine is None:
-            return
+            return None
 
-        surface.fill(colors_mod.BG)
+        # Everything above the keyboard is redrawn each frame; the keyboard
+        # and the hint over it only when the held keys change
         w, h = surface.get_size()
-
-        regions = layout_regions(
-            pygame.Rect(0, 0, w, h),
-            [
-                ("hud", "top", 44),
-                ("keyboard", "bottom", 120),
-            ] + ([("notation", "top", 180)] if self._show_notation else []),
-        )
+        surface.fill(colors_mod.BG, waterfall_area(surface))
+
+        layout_key = (w, h, self._show_notation)
+        if layout_key != self._layout_key:
+            self._layout = layout_regions(
+                pygame.Rect(0, 0, w, h),
+                [
+                    ("hud", "top", 44),
+                    ("keyboard", "bottom", 120),
+                ] + ([("notation", "top", 180)] if self._show_notation else []),
+            )
+            self._layout_key = layout_key
+        regions = self._layout
 
         # Notation panel
         if self._show_notation:
@@ -215,33 +273,46 @@ class PracticeView:
             )
 
         # Waterfall in center region
-        render_waterfall(surface, engine.song, engine.position)
-
-        # Keyboard
-        render_keyboard(surface, self._pressed)
+        dirty = [render_waterfall(surface, engine.song, engine.position)]
+
+        # Keyboard, with the controls hint drawn over it
+        keyboard_key = (w, h, self._pressed)
+        if keyboard_key != self._keyboard_key:
+            keyboard_rect = pygame.Rect(0, KEYBOARD_Y, w, h - KEYBOARD_Y)
+            surface.fill(colors_mod.BG, keyboard_rect)
+            render_keyboard(surface, self.pressed_set)
+            if self._hint_surf:
+                surface.blit(self._hint_surf, (10, h - 25))
+            self._keyboard_key = keyboard_key
+            dirty.append(keyboard_rect)
 
         # HUD
+        if self._stats_dirty:
+            self._update_accuracy()
         render_hud(surface, self._stats)
 
         # Status info
-        if self._font:
-            info_parts = [
-                f"Tempo: {engine.tempo_scale:.0%}",
-                f"{'WAIT' if engine.wait_mode else 'PLAY'}",
-                f"Hand: {engine.active_hand.name}",
-            ]
-            if self._looping:
-                info_parts.append(f"Loop: bars {self._section_start}-{self._section_end} (#{self._loop_count})")
-            if engine.paused:
-                info_parts.append("PAUSED")
-            info_text = " | ".join(info_parts)
-            rendered = self._font.render(info_text, True, colors_mod.HUD_TEXT)
+        if self._status_glyphs:
+            status_key = (
+                engine.tempo_scale, engine.wait_mode, engine.active_hand, engine.paused,
+                self._looping, self._section_start, self._section_end, self._loop_count,
+            )
+            if status_key != self._status_key or self._status_surf is None:
+                info_parts = [
+                    f"Tempo: {engine.tempo_scale:.0%}",
+                    f"{'WAIT' if engine.wait_mode else 'PLAY'}",
+                    f"Hand: {engine.active_hand.name}",
+                ]
+                if self._looping:
+                    info_parts.append(
+                        f"Loop: bars {self._section_start}-{self._section_end} (#{self._loop_count})"
+                    )
+                if engine.paused:
+                    info_parts.append("PAUSED")
+                info_text = " | ".join(info_parts)
+                self._status_surf = self._status_glyphs.render(info_text)
+                self._status_key = status_key
+            rendered = self._status_surf
             surface.blit(rendered, (w - rendered.get_width() - 10, 10))
 
-        # Controls hint
-        if self._font:
-            hint = self._font.render(
-                "N:notation L:loop [/]:section W:wait +/-:tempo 1/2/3:hand R:restart",
-                True, (80, 80, 100),
-            )
-            surface.blit(hint, (10, h - 25))
+        return dirty
@@ -2,34 +2,121 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 import pygame
 
-from keyfall.evaluator import evaluate_hit
-from keyfall.models import Hand, HitGrade, NoteEvent, SessionStats, Song
+from keyfall.evaluator import sweep_pending
+from keyfall.models import Hand, NoteEvent, SessionStats, Song
 from keyfall.playback import PlaybackEngine
 from keyfall.renderer import colors as colors_mod
 from keyfall.renderer.hud import render_hud
-from keyfall.renderer.keyboard import render_keyboard
-from keyfall.renderer.waterfall import render_waterfall
-from keyfall.views.base import ViewAction, ViewContext
+from keyfall.renderer.keyboard import KEYBOARD_Y, render_keyboard
+from keyfall.renderer.text import GlyphAtlas
+from keyfall.renderer.waterfall import render_waterfall, waterfall_area
+from keyfall.views.base import (
+    ViewAction,
+    ViewContext,
+    allow_all_events,
+    block_non_gameplay_events,
+    mask_pitches,
+)
+
+
+def _pop(engine: PlaybackEngine) -> ViewAction:
+    return ViewAction(kind="pop")
+
+
+def _toggle_pause(engine: PlaybackEngine) -> None:
+    engine.paused = not engine.paused
+
+
+def _toggle_wait(engine: PlaybackEngine) -> None:
+    engine.wait_mode = not engine.wait_mode
+
+
+def _restart(engine: PlaybackEngine) -> None:
+    engine.seek(0.0)
+
+
+def _tempo_down(engine: PlaybackEngine) -> None:
+    engine.set_tempo_scale(engine.tempo_scale - 0.05)
+
+
+def _tempo_up(engine: PlaybackEngine) -> None:
+    engine.set_tempo_scale(engine.tempo_scale + 0.05)
+
+
+def _tempo_reset(engine: PlaybackEngine) -> None:
+    engine.set_tempo_scale(1.0)
+
+
+def _hand_both(engine: PlaybackEngine) -> None:
+    engine.active_hand = Hand.BOTH
+
+
+def _hand_right(engine: PlaybackEngine) -> None:
+    engine.active_hand = Hand.RIGHT
+
+
+def _hand_left(engine: PlaybackEngine) -> None:
+    engine.active_hand = Hand.LEFT
+
+
+# Key -> action on the engine; a returned ViewAction is passed on to the manager
+_KEY_HANDLERS: dict[int, Callable[[PlaybackEngine], ViewAction | None]] = {
+    pygame.K_ESCAPE: _pop,
+    pygame.K_SPACE: _toggle_pause,
+    pygame.K_w: _toggle_wait,
+    pygame.K_r: _restart,
+    pygame.K_MINUS: _tempo_down,
+    pygame.K_KP_MINUS: _tempo_down,
+    pygame.K_EQUALS: _tempo_up,
+    pygame.K_KP_PLUS: _tempo_up,
+    pygame.K_0: _tempo_reset,
+    pygame.K_1: _hand_both,
+    pygame.K_2: _hand_right,
+    pygame.K_3: _hand_left,
+}
+
+# Keys after which audio queued ahead of the old position must not sound
+_SILENCING_KEYS = frozenset({pygame.K_SPACE, pygame.K_r})
 
 
 class WaterfallView:
     name = "waterfall"
     display_name = "Classic Waterfall"
+    __slots__ = (
+        "_context", "_engine", "_stats", "_pressed", "_pressed_cache", "_streak", "_pending_notes",
+        "_stats_dirty", "_font", "_status_key", "_status_surf", "_status_glyphs",
+        "_keyboard_key",
+    )
 
     def __init__(self) -> None:
         self._context: ViewContext | None = None
         self._engine: PlaybackEngine | None = None
         self._stats = SessionStats()
-        self._pressed: set[int] = set()
+        # Held pitches as a bitmask (bit p set while pitch p is down), and the
+        # (mask, frozenset) last built from it for the engine and keyboard
+        self._pressed: int = 0
+        self._pressed_cache: tuple[int, frozenset[int]] = (0, frozenset())
         self._streak: int = 0
         self._pending_notes: list[NoteEvent] = []
+        # Set when grades were counted since accuracy was last recomputed
+        self._stats_dirty: bool = False
         self._font: pygame.font.Font | None = None
+        # Rendered status bar and the (tempo, wait, hand, paused) state it shows
+        self._status_key: tuple | None = None
+        self._status_surf: pygame.Surface | None = None
+        self._status_glyphs: GlyphAtlas | None = None
+        # (width, height, held-key mask) the keyboard on screen was drawn for
+        self._keyboard_key: tuple[int, int, int] | None = None
 
     def on_enter(self, context: ViewContext) -> None:
         self._context = context
         self._font = pygame.font.SysFont("monospace", 18)
+        self._status_surf = None
+        self._status_glyphs = GlyphAtlas(self._font, colors_mod.HUD_TEXT)
         song = context.song
         if song is None:
             song = Song(title="Empty")
@@ -38,10 +125,14 @@ class WaterfallView:
         self._engine.active_hand = context.hand
         self._stats = SessionStats(song_title=song.title)
         self._streak = 0
-        self._pressed = set()
+        self._pressed = 0
         self._pending_notes = []
+        self._stats_dirty = False
+        self._keyboard_key = None
+        block_non_gameplay_events()
 
     def on_exit(self) -> None:
+        allow_all_events()
         if self._context and self._context.audio:
             self._context.audio.all_notes_off()
         if self._context and self._context.progress:
@@ -56,29 +147,12 @@ class WaterfallView:
         if engine is None:
             return None
 
-        if event.key == pygame.K_ESCAPE:
-            return ViewAction(kind="pop")
-        elif event.key == pygame.K_SPACE:
-            engine.paused = not engine.paused
-        elif event.key == pygame.K_w:
-            engine.wait_mode = not engine.wait_mode
-        elif event.key == pygame.K_r:
-            engine.position = 0.0
-            engine.note_index = 0
-        elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
-            engine.set_tempo_scale(engine.tempo_scale - 0.05)
-        elif event.key == pygame.K_EQUALS or event.key == pygame.K_KP_PLUS:
-            engine.set_tempo_scale(engine.tempo_scale + 0.05)
-        elif event.key == pygame.K_0:
-            engine.set_tempo_scale(1.0)
-        elif event.key == pygame.K_1:
-            engine.active_hand = Hand.BOTH
-        elif event.key == pygame.K_2:
-            engine.active_hand = Hand.RIGHT
-        elif event.key == pygame.K_3:
-            engine.active_hand = Hand.LEFT
-
-        return None
+        handler = _KEY_HANDLERS.get(event.key)
+        if handler is None:
+            return None
+        if event.key in _SILENCING_KEYS and self._context and self._context.audio:
+            self._context.audio.all_notes_off()
+        return handler(engine)
 
     def update(self, dt: float) -> ViewAction | None:
         engine = self._engine
@@ -86,96 +160,116 @@ class WaterfallView:
             return None
 
         # Poll MIDI and keyboard input
-        if self._context:
-            for source in (self._context.midi_input, self._context.keyboard_input):
+        context = self._context
+        audio = context.audio if context else None
+        if context:
+            pressed = self._pressed
+            sounds: list[tuple[int, int]] = []  # (pitch, velocity), 0 for a release
+            for source in (context.midi_input, context.keyboard_input):
                 if source is None:
                     continue
-                while True:
-                    evt = source.poll()
-                    if evt is None:
-                        break
-                    if evt.is_note_on:
-                        self._pressed.add(evt.pitch)
-                        if self._context.audio:
-                            self._context.audio.note_on(evt.pitch, evt.velocity)
+                notes = source.poll_notes()
+                for pitch, velocity in notes:
+                    if velocity:
+                        pressed |= 1 << pitch
                     else:
-                        self._pressed.discard(evt.pitch)
-                        if self._context.audio:
-                            self._context.audio.note_off(evt.pitch)
+                        pressed &= ~(1 << pitch)
+                sounds += notes
+            self._pressed = pressed
+            if sounds and audio:
+                audio.play_notes(sounds)
 
         # Advance playback
-        newly_active = engine.update(dt, self._pressed)
+        newly_active = engine.update(dt, self.pressed_set)
+        scheduled = engine.schedule_ahead(autoplay_only=True)
 
         # Evaluate hits
-        for note in newly_active:
-            self._pending_notes.append(note)
+        self._pending_notes.extend(newly_active)
 
-        # Auto-play inactive hand audio
-        if self._context and self._context.audio:
-            for note in newly_active:
-                if engine.active_hand != Hand.BOTH and note.hand != engine.active_hand:
-                    self._context.audio.play_note_event(note)
+        # Auto-play inactive hand audio: timed ahead while playing, on arrival in wait mode
+        if audio and engine.active_hand is not Hand.BOTH:
+            for delay, note in scheduled:
+                audio.schedule_note_event(note, delay)
+            if engine.wait_mode:
+                for note in engine.autoplay_activated():
+                    audio.play_note_event(note)
+            audio.flush_pending_offs()
 
         # Evaluate pending notes against pressed keys
-        still_pending: list[NoteEvent] = []
-        for note in self._pending_notes:
-            age = engine.position - note.start_time
-            if age > 0.3:  # missed
-                self._stats.missed += 1
-                self._streak = 0
-            elif note.pitch in self._pressed:
-                result = evaluate_hit(note, note.pitch, engine.position)
-                if result.grade == HitGrade.PERFECT:
-                    self._stats.perfect += 1
-                    self._streak += 1
-                elif result.grade == HitGrade.GOOD:
-                    self._stats.good += 1
-                    self._streak += 1
-                elif result.grade == HitGrade.OK:
-                    self._stats.ok += 1
-                    self._streak += 1
-                else:
-                    self._stats.missed += 1
-                    self._streak = 0
-                self._stats.max_streak = max(self._stats.max_streak, self._streak)
-            else:
-                still_pending.append(note)
-                continue
-            self._update_accuracy()
-        self._pending_notes = still_pending
+        counts, self._streak, peak = sweep_pending(
+            self._pending_notes, self._pressed, engine.position, self._streak
+        )
+        stats = self._stats
+        if peak > stats.max_streak:
+            stats.max_streak = peak
+        if any(counts):
+            stats.perfect += counts[0]
+            stats.good += counts[1]
+            stats.ok += counts[2]
+            stats.missed += counts[3]
+            self._stats_dirty = True
 
         if engine.finished and not self._pending_notes:
             return ViewAction(kind="pop")
 
         return None
 
+    @property
+    def pressed_set(self) -> frozenset[int]:
+        """The held pitches as a set, rebuilt only when the mask has changed."""
+        mask, pitches = self._pressed_cache
+        if mask != self._pressed:
+            pitches = mask_pitches(self._pressed)
+            self._pressed_cache = (self._pressed, pitches)
+        return pitches
+
     def _update_accuracy(self) -> None:
+        self._stats_dirty = False
         hit = self._stats.perfect + self._stats.good + self._stats.ok
         total = hit + self._stats.missed
         self._stats.total_notes = total
         self._stats.accuracy_pct = (hit / total * 100.0) if total > 0 else 0.0
 
-    def draw(self, surface: pygame.Surface) -> None:
+    def invalidate(self) -> None:
+        """Redraw the keyboard on the next draw(), e.g. after the window was exposed."""
+        self._keyboard_key = None
+
+    def draw(self, surface: pygame.Surface) -> list[pygame.Rect] | None:
         engine = self._engine
         if engine is None:
-            return
-
-        surface.fill(colors_mod.BG)
+            return None
 
-        render_waterfall(surface, engine.song, engine.position)
-        render_keyboard(surface, self._pressed)
+        # The waterfall (with the HUD over it) changes every frame; the
+        # keyboard below it only when the held keys do
+        w, h = surface.get_size()
+        surface.fill(colors_mod.BG, waterfall_area(surface))
+        dirty = [render_waterfall(surface, engine.song, engine.position)]
+        keyboard_key = (w, h, self._pressed)
+        if keyboard_key != self._keyboard_key:
+            keyboard_rect = pygame.Rect(0, KEYBOARD_Y, w, h - KEYBOARD_Y)
+            surface.fill(colors_mod.BG, keyboard_rect)
+            render_keyboard(surface, self.pressed_set)
+            self._keyboard_key = keyboard_key
+            dirty.append(keyboard_rect)
+        if self._stats_dirty:
+            self._update_accuracy()
         render_hud(surface, self._stats)
 
         # Status bar at bottom-right
-        if self._font:
-            w = surface.get_width()
-            info_parts = [
-                f"Tempo: {engine.tempo_scale:.0%}",
-                f"{'WAIT' if engine.wait_mode else 'PLAY'}",
-                f"Hand: {engine.active_hand.name}",
-            ]
-            if engine.paused:
-                info_parts.append("PAUSED")
-            info_text = " | ".join(info_parts)
-            rendered = self._font.render(info_text, True, colors_mod.HUD_TEXT)
+        if self._status_glyphs:
+            status_key = (engine.tempo_scale, engine.wait_mode, engine.active_hand, engine.paused)
+            if status_key != self._status_key or self._status_surf is None:
+                info_parts = [
+                    f"Tempo: {engine.tempo_scale:.0%}",
+                    f"{'WAIT' if engine.wait_mode else 'PLAY'}",
+                    f"Hand: {engine.active_hand.name}",
+                ]
+                if engine.paused:
+                    info_parts.append("PAUSED")
+                info_text = " | ".join(info_parts)
+                self._status_surf = self._status_glyphs.render(info_text)
+                self._status_key = status_key
+            rendered = self._status_surf
             surface.blit(rendered, (w - rendered.get_width() - 10, 10))
+
+        return dirty
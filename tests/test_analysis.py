@@ -0,0 +1,39 @@
+"""Tests for the shared song analysis."""
+
+from keyfall.ai.analysis import analyze
+from keyfall.models import NoteEvent, Song
+
+
+def _song(*pitches):
+    notes = [NoteEvent(pitch=p, start_time=float(i), duration=1.0) for i, p in enumerate(pitches)]
+    return Song(notes=notes, duration=float(len(notes)))
+
+
+def test_analysis_reused_for_unchanged_song():
+    song = _song(60, 62, 64)
+    assert analyze(song, 2.0) is analyze(song, 2.0)
+
+
+def test_edited_song_gets_fresh_analysis():
+    song = _song(60, 62, 64)
+    assert list(analyze(song, 2.0).pitch) == [60, 62, 64]
+
+    # Same number of notes, so only the invalidated column view tells them apart
+    song.notes = _song(48, 50, 52).notes
+    assert list(analyze(song, 2.0).pitch) == [48, 50, 52]
+
+    song.notes[0] = NoteEvent(pitch=55, start_time=0.0, duration=1.0)
+    song.invalidate_columns()
+    analysis = analyze(song, 2.0)
+    assert list(analysis.pitch) == [55, 50, 52]
+    assert analysis.notes[0].pitch == 55
+
+
+def test_changed_duration_gets_fresh_bars():
+    song = _song(60, 62, 64)
+    assert analyze(song, 2.0).total_bars == 2
+
+    song.duration = 8.0
+    analysis = analyze(song, 2.0)
+    assert analysis.total_bars == 5
+    assert analysis.edges == [0, 2, 3, 3, 3, 3]
@@ -1,6 +1,14 @@
 """Tests for hit evaluation logic."""
 
-from keyfall.evaluator import evaluate_hit
+import pytest
+
+from keyfall.evaluator import (
+    HitTracker,
+    evaluate_hit,
+    evaluate_hit_timing,
+    evaluate_hits,
+    sweep_pending,
+)
 from keyfall.models import HitGrade, NoteEvent
 
 
@@ -26,3 +34,41 @@ def test_late_hit_is_miss():
     note = NoteEvent(pitch=60, start_time=1.0, duration=0.5)
     result = evaluate_hit(note, played_pitch=60, played_time=1.5)
     assert result.grade == HitGrade.MISS
+
+
+def test_batch_matches_single_hits():
+    note = NoteEvent(pitch=60, start_time=1.0, duration=0.5)
+    cases = [(60, 1.02), (60, 1.05), (60, 0.92), (60, 1.2), (60, 1.5), (61, 1.0)]
+    pitches = [p for p, _ in cases]
+    times = [t for _, t in cases]
+    batch = evaluate_hits([note] * len(cases), pitches, times)
+    assert batch == [evaluate_hit(note, p, t) for p, t in cases]
+
+
+def test_tracker_offset_stats_skip_misses():
+    notes = [NoteEvent(pitch=60 + i, start_time=float(i), duration=0.5) for i in range(3)]
+    tracker = HitTracker(notes)
+    tracker.feed(60, 0.01)
+    tracker.feed(61, 1.03)
+    tracker.flush_misses(5.0)
+    assert tracker.mean_timing_offset_ms == pytest.approx(20.0)
+    assert tracker.std_timing_offset_ms == pytest.approx(10.0)
+    assert tracker.get_stats().missed == 1
+
+
+def test_timing_grade_matches_single_hit():
+    note = NoteEvent(pitch=60, start_time=1.0, duration=0.5)
+    for played_time in (1.0, 1.02, 1.05, 0.92, 1.2, 1.5):
+        expected = evaluate_hit(note, 60, played_time).grade
+        assert evaluate_hit_timing(note.start_time, played_time) == expected
+
+
+def test_sweep_pending_grades_held_and_expires_old():
+    old = NoteEvent(pitch=60, start_time=0.0, duration=0.5)
+    held = NoteEvent(pitch=62, start_time=1.0, duration=0.5)
+    waiting = NoteEvent(pitch=64, start_time=1.0, duration=0.5)
+    pending = [old, held, waiting]
+    counts, streak, peak = sweep_pending(pending, 1 << 62, 1.02, streak=3)
+    assert pending == [waiting]
+    assert counts == [1, 0, 0, 1]
+    assert (streak, peak) == (1, 1)
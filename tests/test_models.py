@@ -1,6 +1,6 @@
 """Tests for core data models."""
 
-from keyfall.models import NoteEvent, Song
+from keyfall.models import NoteColumns, NoteEvent, Song
 from keyfall.playback import select_section, split_hands
 from keyfall.models import Hand
 
@@ -29,3 +29,54 @@ def test_select_section():
     section = select_section(song, start_bar=2, end_bar=2)
     assert len(section.notes) == 1
     assert section.notes[0].pitch == 62
+
+
+def test_columns_follow_replaced_notes():
+    song = Song(notes=[NoteEvent(pitch=60, start_time=0.0, duration=1.0)])
+    assert list(song.columns().pitch) == [60]
+
+    song.notes = [NoteEvent(pitch=72, start_time=2.0, duration=0.5)]
+    cols = song.columns()
+    assert list(cols.pitch) == [72]
+    assert list(cols.start_time) == [2.0]
+
+
+def test_columns_rebuilt_after_in_place_edit():
+    song = Song(notes=[NoteEvent(pitch=60, start_time=0.0, duration=1.0)])
+    song.columns()
+
+    song.notes.append(NoteEvent(pitch=64, start_time=1.0, duration=1.0))
+    assert list(song.columns().pitch) == [60, 64]
+
+    song.notes[0] = NoteEvent(pitch=62, start_time=0.5, duration=1.0)
+    song.invalidate_columns()
+    assert list(song.columns().pitch) == [62, 64]
+    assert song.columns().start_time[0] == 0.5
+
+
+def _assert_columns_match_notes(song):
+    cols = song.columns()
+    expected = NoteColumns.from_notes(song.notes)
+    for name in ("start_time", "duration", "pitch", "velocity", "hand", "track"):
+        assert list(getattr(cols, name)) == list(getattr(expected, name)), name
+    assert cols.max_duration == expected.max_duration
+
+
+def test_split_and_section_columns_match_their_notes():
+    from keyfall.models import TempoChange
+    song = Song(
+        notes=[
+            NoteEvent(pitch=48, start_time=0.0, duration=3.0, velocity=50, hand=Hand.LEFT),
+            NoteEvent(pitch=60, start_time=0.0, duration=1.0, velocity=90, hand=Hand.RIGHT),
+            NoteEvent(pitch=64, start_time=4.0, duration=0.5, hand=Hand.RIGHT, track=1),
+            NoteEvent(pitch=43, start_time=5.0, duration=2.0, hand=Hand.LEFT, track=1),
+            NoteEvent(pitch=67, start_time=8.0, duration=1.0, hand=Hand.RIGHT),
+        ],
+        tempo_changes=[TempoChange(time=0.0, bpm=60.0)],
+    )
+    for part in split_hands(song):
+        _assert_columns_match_notes(part)
+    section = select_section(song, start_bar=2, end_bar=2)
+    assert [n.start_time for n in section.notes] == [0.0, 1.0]
+    _assert_columns_match_notes(section)
+    _assert_columns_match_notes(select_section(song, start_bar=5, end_bar=6))
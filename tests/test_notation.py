@@ -0,0 +1,32 @@
+"""Tests for notation layout."""
+
+import pytest
+
+pytest.importorskip("pygame")
+
+from keyfall.models import NoteEvent, Song  # noqa: E402
+from keyfall.notation import _note_geometry  # noqa: E402
+
+
+def test_geometry_follows_edited_notes():
+    song = Song(notes=[
+        NoteEvent(pitch=64, start_time=0.0, duration=1.0),
+        NoteEvent(pitch=67, start_time=1.0, duration=1.0),
+    ])
+    before = _note_geometry(song)
+    assert before.treble == b"\x01\x01"
+    assert _note_geometry(song) is before
+
+    # Same number of notes, now with the first one on the bass staff
+    song.notes[0] = NoteEvent(pitch=43, start_time=0.0, duration=1.0)
+    song.invalidate_columns()
+    geo = _note_geometry(song)
+    assert geo.treble == b"\x00\x01"
+    assert geo.y_offset[0] != before.y_offset[0]
+    assert list(geo.y_offset[1:]) == list(before.y_offset[1:])
+
+    song.notes = [NoteEvent(pitch=61, start_time=0.0, duration=2.0)] * 2
+    geo = _note_geometry(song)
+    assert geo.treble == b"\x01\x01"
+    assert geo.sharp == b"\x01\x01"
+    assert geo.filled == b"\x00\x00"
@@ -0,0 +1,122 @@
+"""Tests for the playback engine."""
+
+from dataclasses import replace
+
+from keyfall.models import Hand, NoteEvent, Song
+from keyfall.playback import Metronome, PlaybackEngine
+
+
+def _song():
+    return Song(notes=[
+        NoteEvent(pitch=60, start_time=0.0, duration=0.5, hand=Hand.RIGHT),
+        NoteEvent(pitch=48, start_time=0.0, duration=0.5, hand=Hand.LEFT),
+        NoteEvent(pitch=62, start_time=0.5, duration=0.5, hand=Hand.RIGHT),
+        NoteEvent(pitch=50, start_time=1.0, duration=0.5, hand=Hand.LEFT),
+    ])
+
+
+def test_schedule_ahead_returns_each_note_once_with_delay():
+    engine = PlaybackEngine(_song())
+    engine.lookahead = 0.5
+    engine.set_tempo_scale(0.5)
+    assert [(d, n.pitch) for d, n in engine.schedule_ahead()] == [(0.0, 60), (0.0, 48), (1.0, 62)]
+    assert engine.schedule_ahead() == []
+
+    engine.update(1.0, frozenset())  # 0.5 song seconds at half tempo
+    assert [(d, n.pitch) for d, n in engine.schedule_ahead()] == [(1.0, 50)]
+
+
+def test_schedule_ahead_autoplay_only():
+    engine = PlaybackEngine(_song())
+    engine.active_hand = Hand.RIGHT
+    engine.lookahead = 1.0
+    assert [n.pitch for _, n in engine.schedule_ahead(autoplay_only=True)] == [48, 50]
+
+
+def test_autoplay_follows_reassigned_hands():
+    song = _song()
+    engine = PlaybackEngine(song)
+    engine.active_hand = Hand.RIGHT
+    engine.lookahead = 1.0
+    assert [n.pitch for _, n in engine.schedule_ahead(autoplay_only=True)] == [48, 50]
+
+    # Same number of notes, with the hands swapped
+    swap = {Hand.LEFT: Hand.RIGHT, Hand.RIGHT: Hand.LEFT}
+    song.notes = [replace(n, hand=swap[n.hand]) for n in song.notes]
+    engine.seek(0.0)
+    assert [n.pitch for _, n in engine.schedule_ahead(autoplay_only=True)] == [60, 62]
+
+    song.notes[0].hand = Hand.RIGHT
+    song.invalidate_columns()
+    engine.seek(0.0)
+    assert [n.pitch for _, n in engine.schedule_ahead(autoplay_only=True)] == [62]
+
+
+def test_nothing_scheduled_while_paused_or_waiting():
+    engine = PlaybackEngine(_song())
+    engine.lookahead = 1.0
+    engine.paused = True
+    assert engine.schedule_ahead() == []
+
+    engine.paused = False
+    engine.wait_mode = True
+    engine.update(0.1, frozenset({60, 48}))
+    assert engine.schedule_ahead() == []
+
+    # Leaving wait mode doesn't replay the notes already played through
+    engine.wait_mode = False
+    assert [n.pitch for _, n in engine.schedule_ahead()] == [62, 50]
+
+
+def test_seek_reschedules_from_new_position():
+    engine = PlaybackEngine(_song())
+    engine.lookahead = 2.0
+    assert len(engine.schedule_ahead()) == 4
+
+    engine.seek(0.5)
+    assert engine.note_index == 2
+    assert [n.pitch for _, n in engine.schedule_ahead()] == [62, 50]
+
+    engine.seek(0.0)
+    assert [n.pitch for _, n in engine.schedule_ahead()] == [60, 48, 62, 50]
+
+
+def test_autoplay_activated():
+    engine = PlaybackEngine(_song())
+    engine.active_hand = Hand.LEFT
+    engine.update(0.6, frozenset())
+    assert [n.pitch for n in engine.autoplay_activated()] == [60, 62]
+
+    engine.paused = True
+    engine.update(1.0, frozenset())
+    assert engine.autoplay_activated() == []
+
+    engine.paused = False
+    engine.active_hand = Hand.BOTH
+    engine.update(1.0, frozenset())
+    assert engine.autoplay_activated() == []
+
+
+def test_metronome_clicks_on_beats_with_accented_downbeat():
+    metronome = Metronome(bpm=120.0, beats_per_bar=2)
+    assert metronome.update(1.0) == []  # disabled
+
+    metronome.enabled = True
+    clicks = []
+    for _ in range(12):  # 1.5 s in eighth-second frames
+        clicks += metronome.update(0.125)
+    assert clicks == [(76, 100), (37, 70), (76, 100)]
+
+
+def test_metronome_tempo_change_keeps_last_click_as_anchor():
+    metronome = Metronome(bpm=120.0)
+    metronome.enabled = True
+    assert len(metronome.update(0.625)) == 1  # click at 0.5 s
+
+    # At double tempo the beats are 0.25 s apart, counted from the 0.5 s click
+    assert metronome.update(0.0625, tempo_scale=2.0) == []
+    assert len(metronome.update(0.0625, tempo_scale=2.0)) == 1  # 0.75 s
+    assert len(metronome.update(0.25, tempo_scale=2.0)) == 1  # 1.0 s
+
+    metronome.reset()
+    assert metronome.update(0.5, tempo_scale=2.0) == [(76, 100), (37, 70)]
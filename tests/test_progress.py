@@ -0,0 +1,24 @@
+"""Tests for session progress persistence."""
+
+from keyfall.models import SessionStats
+from keyfall.progress import ProgressTracker
+
+
+def test_save_sessions_in_one_batch(tmp_path):
+    tracker = ProgressTracker(tmp_path / "progress.db")
+    try:
+        tracker.save_sessions([])
+        assert tracker.get_history() == []
+
+        tracker.save_sessions(
+            SessionStats(song_title=title, max_streak=streak, accuracy_pct=acc)
+            for title, streak, acc in [("a", 3, 50.0), ("a", 7, 90.0), ("b", 1, 10.0)]
+        )
+        tracker.save_session(SessionStats(song_title="a", max_streak=5, accuracy_pct=70.0))
+
+        assert len(tracker.get_history()) == 4
+        assert sorted(tracker.get_streak_history("a")) == [3, 5, 7]  # same played_at
+        assert tracker.get_best("a")["accuracy_pct"] == 90.0
+        assert tracker.get_best("c") is None
+    finally:
+        tracker.close()
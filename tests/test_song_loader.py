@@ -0,0 +1,31 @@
+"""Tests for song loading."""
+
+import pytest
+
+mido = pytest.importorskip("mido")
+
+from keyfall.song_loader import HandSplitStrategy, load_song  # noqa: E402
+
+
+def test_midi_notes_sorted_by_start_keeping_track_order(tmp_path):
+    mid = mido.MidiFile(ticks_per_beat=480)
+    for notes in ([(60, 0, 480), (62, 480, 480)], [(48, 0, 960), (50, 240, 240)]):
+        track = mido.MidiTrack()
+        now = 0
+        events = []
+        for pitch, start, length in notes:
+            events.append((start, mido.Message("note_on", note=pitch, velocity=80)))
+            events.append((start + length, mido.Message("note_off", note=pitch)))
+        for tick, msg in sorted(events, key=lambda e: e[0]):
+            track.append(msg.copy(time=tick - now))
+            now = tick
+        mid.tracks.append(track)
+    path = tmp_path / "two_tracks.mid"
+    mid.save(str(path))
+
+    song = load_song(path, HandSplitStrategy.BY_TRACK)
+    # Ties in start time keep track order, as the stable sort promises
+    assert [(n.pitch, n.track) for n in song.notes] == [(60, 0), (48, 1), (50, 1), (62, 0)]
+    assert [n.start_time for n in song.notes] == pytest.approx([0.0, 0.0, 0.25, 0.5])
+    assert [n.duration for n in song.notes] == pytest.approx([0.5, 1.0, 0.25, 0.5])
+    assert song.duration == pytest.approx(1.0)